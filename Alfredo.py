@@ -1,178 +1,21 @@
 import streamlit as st
 from streamlit_calendar import calendar
 from datetime import datetime, timedelta
-from departamentos import departamentos
-from colaboradores_por_departamento import colaboradores_por_departamento
 import os
-from pymongo import MongoClient
-
-# Remover a importação do mongodb.py
-# from mongodb import user, secure_password, string
-
-# Configuração do MongoDB Atlas com segredos do Streamlit
-def get_database():
-    try:
-        # Tentar usar os segredos do Streamlit Cloud
-        try:
-            user = st.secrets["mongodb"]["username"]
-            password = st.secrets["mongodb"]["password"]
-            cluster_url = st.secrets["mongodb"]["cluster_url"]
-            connection_string = f"mongodb+srv://{user}:{password}@{cluster_url}/?retryWrites=true&w=majority"
-            
-            # Conectar ao MongoDB Atlas
-            client = MongoClient(connection_string, serverSelectionTimeoutMS=5000)
-            
-            # Teste de conexão com timeout
-            client.admin.command('ping')
-            st.success("Conectado ao MongoDB Atlas com sucesso!")
-            
-            # Acessar o banco de dados 'alfredo_db'
-            return client['alfredo_db']
-            
-        except Exception as e:
-            st.warning(f"Não foi possível conectar usando segredos do Streamlit: {str(e)}")
-            
-            # Fallback para credenciais locais
-            try:
-                from mongodb import user, secure_password, string
-                connection_string = string.replace('<db_password>', secure_password)
-                
-                # Conectar ao MongoDB Atlas com credenciais locais
-                client = MongoClient(connection_string, serverSelectionTimeoutMS=5000)
-                
-                # Teste de conexão com timeout
-                client.admin.command('ping')
-                st.success("Conectado ao MongoDB Atlas com credenciais locais!")
-                
-                # Acessar o banco de dados 'alfredo_db'
-                return client['alfredo_db']
-            except Exception as local_error:
-                st.error(f"Erro ao conectar com credenciais locais: {str(local_error)}")
-                return None
-            
-    except Exception as e:
-        st.error(f"Erro ao conectar ao MongoDB Atlas: {str(e)}")
-        st.warning("Usando banco de dados local como fallback.")
-        return None
-
-# Função para carregar eventos do MongoDB
-# Função para carregar eventos do MongoDB
-def carregar_eventos():
-    try:
-        db = get_database()
-        if db is not None:  # Corrigido: usar 'is not None' em vez de 'if db'
-            # Obter a coleção 'eventos' (será criada se não existir)
-            collection = db['eventos']
-            
-            # Buscar todos os eventos, excluindo o campo _id
-            eventos_cursor = collection.find({}, {'_id': 0})
-            
-            # Converter para lista e garantir que todos os dados sejam serializáveis
-            eventos = []
-            for evento in eventos_cursor:
-                # Converter qualquer ObjectId para string
-                evento_serializable = {}
-                for chave, valor in evento.items():
-                    from bson import ObjectId
-                    if isinstance(valor, ObjectId):
-                        evento_serializable[chave] = str(valor)
-                    else:
-                        evento_serializable[chave] = valor
-                eventos.append(evento_serializable)
-            
-            if eventos:
-                st.success(f"Carregados {len(eventos)} eventos do MongoDB com sucesso!")
-                return eventos
-            else:
-                st.warning("Nenhum evento encontrado no MongoDB. Usando dados locais.")
-                import banco_eventos
-                return banco_eventos.eventos_db
-        else:
-            # Fallback para o arquivo local se não conseguir conectar ao MongoDB
-            import banco_eventos
-            st.warning("Usando banco de dados local como fallback.")
-            return banco_eventos.eventos_db
-    except Exception as e:
-        st.error(f"Erro ao carregar eventos: {e}")
-        # Garantir que sempre retorne uma lista, mesmo em caso de erro
-        import banco_eventos
-        return banco_eventos.eventos_db
-
-# Função para salvar eventos no MongoDB
-# Função para salvar eventos no MongoDB
-def salvar_eventos():
-    try:
-        db = get_database()
-        if db is not None:  # Corrigido: usar 'is not None' em vez de 'if db'
-            collection = db['eventos']
-            # Limpar todos os eventos existentes
-            collection.delete_many({})
-            
-            # Garantir que todos os eventos sejam serializáveis
-            eventos_serializaveis = []
-            for evento in st.session_state.events:
-                # Converter qualquer ObjectId para string
-                evento_serializable = {}
-                for chave, valor in evento.items():
-                    from bson import ObjectId
-                    if isinstance(valor, ObjectId):
-                        evento_serializable[chave] = str(valor)
-                    else:
-                        evento_serializable[chave] = valor
-                eventos_serializaveis.append(evento_serializable)
-            
-            # Inserir os eventos atuais
-            if eventos_serializaveis:
-                result = collection.insert_many(eventos_serializaveis)
-                st.success(f"Eventos salvos com sucesso! {len(result.inserted_ids)} eventos gravados no MongoDB.")
-            else:
-                st.warning("Nenhum evento para salvar.")
-        else:
-            st.error("Não foi possível conectar ao banco de dados. Alterações não foram salvas.")
-            # Tenta fazer um backup local como fallback
-            try:
-                import json
-                import os
-                from datetime import datetime
-                
-                backup_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups')
-                os.makedirs(backup_dir, exist_ok=True)
-                
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_file = os.path.join(backup_dir, f"backup_local_{timestamp}.json")
-                
-                with open(backup_file, 'w', encoding='utf-8') as f:
-                    json.dump(st.session_state.events, f, ensure_ascii=False, indent=4)
-                
-                st.info(f"Backup local criado em {backup_file}")
-            except Exception as backup_error:
-                st.error(f"Erro ao criar backup local: {backup_error}")
-    except Exception as e:
-        st.error(f"Erro ao salvar eventos: {str(e)}")
-        st.exception(e)  # Mostra o traceback completo do erro
-
-# Função para salvar evento individual
-def salvar_evento(evento):
-    if 'events' not in st.session_state:
-        st.session_state.events = []
-    st.session_state.events.append(evento)
-    salvar_eventos()
-
-# Função para atualizar um evento existente
-def atualizar_evento(idx, evento_atualizado):
-    if 0 <= idx < len(st.session_state.events):
-        st.session_state.events[idx] = evento_atualizado
-        salvar_eventos()
-        return True
-    return False
-
-# Função para excluir um evento
-def excluir_evento(idx):
-    if 0 <= idx < len(st.session_state.events):
-        st.session_state.events.pop(idx)
-        salvar_eventos()
-        return True
-    return False
+from conexao import verificar_conexao
+from armazenamento import TIPO_ARMAZENAMENTO, CAMINHO_SQLITE
+from metricas import metricas, medir
+from esquema import descricao_completa, separar_participantes, evento_para_calendario
+from servico_eventos import (
+    obter_armazenamento, obter_store, salvar_evento, verificar_conflito, atualizar_evento, excluir_evento,
+    exibir_resultados_escrita, sugerir_horarios, salvar_recorrencia, excluir_serie,
+    importar_eventos, eventos_para_exportacao
+)
+from importacao import ler_csv, ler_ics, linhas_csv, linhas_ics
+import io
+from recorrencia import FREQUENCIAS, criar_regra
+from referencia import obter_referencia
+
 
 # Configuração da página
 st.set_page_config(
@@ -194,6 +37,9 @@ with col2:
 with st.sidebar:
     st.image("redelius.png", width=200)
 
+# Resultado das gravações feitas em segundo plano desde o último rerun
+exibir_resultados_escrita()
+
 # Aplicar estilo CSS para centralizar imagens na sidebar
 st.markdown(
     """
@@ -208,9 +54,9 @@ st.markdown(
     unsafe_allow_html=True
 )
 
-# Inicializar o estado da sessão com eventos do MongoDB
-if 'events' not in st.session_state:
-    st.session_state.events = carregar_eventos()
+# Departamentos e colaboradores atuais (recarregados quando a fonte muda)
+referencia = obter_referencia()
+departamentos = referencia.departamentos
 
 # Sidebar para agendamento
 with st.sidebar:
@@ -219,11 +65,8 @@ with st.sidebar:
     # Seleção de departamento
     departamento = st.selectbox("Selecione o Departamento", departamentos)
     
-    # Filtra colaboradores do departamento selecionado
-    colaboradores_dept = [
-        nome for nome, depts in colaboradores_por_departamento.items()
-        if departamento in depts
-    ]
+    # Colaboradores do departamento selecionado (índice montado na carga dos dados de referência)
+    colaboradores_dept = referencia.colaboradores_do_departamento(departamento)
     
     # Seleção de participantes
     participantes = st.multiselect(
@@ -232,10 +75,34 @@ with st.sidebar:
     )
     
     # Data e hora
-    data = st.date_input("Data da Reunião", min_value=datetime.now().date())
-    hora_inicio = st.time_input("Hora de Início")
+    data = st.date_input("Data da Reunião", min_value=datetime.now().date(), key="nova_data")
+    hora_inicio = st.time_input("Hora de Início", key="nova_hora")
     duracao = st.number_input("Duração (horas)", min_value=0.5, max_value=8.0, value=1.0, step=0.5)
+
+    # Sugestão de horários livres para os participantes e o departamento,
+    # nas duas semanas a partir da data escolhida
+    if st.button("Sugerir Horários"):
+        st.session_state.sugestoes_horarios = sugerir_horarios(participantes, departamento, data, duracao)
+    if st.session_state.get('sugestoes_horarios') is not None:
+        sugestoes = st.session_state.sugestoes_horarios
+        if not sugestoes:
+            st.info("Nenhum horário livre encontrado nas próximas duas semanas.")
+        for indice, (inicio_sugerido, fim_sugerido) in enumerate(sugestoes):
+            st.button(
+                f"{inicio_sugerido.strftime('%d/%m %H:%M')} - {fim_sugerido.strftime('%H:%M')}",
+                key=f"sugestao_{indice}",
+                on_click=lambda inicio=inicio_sugerido: st.session_state.update(
+                    nova_data=inicio.date(), nova_hora=inicio.time(), sugestoes_horarios=None
+                )
+            )
     
+    # Repetição: a série é gravada como uma única regra
+    repeticao = st.selectbox("Repetir", ["Não repetir"] + list(FREQUENCIAS))
+    repetir_ate = None
+    if repeticao != "Não repetir":
+        repetir_ate = st.date_input("Repetir até", value=None, min_value=data,
+                                    help="Deixe em branco para repetir sem data final")
+
     # Detalhes da reunião
     titulo = st.text_input("Título da Reunião")
     descricao = st.text_area("Descrição")
@@ -251,46 +118,52 @@ with st.sidebar:
             inicio_dt = datetime.combine(data, hora_inicio)
             fim_dt = inicio_dt + timedelta(hours=duracao)
             
-            # Verifica se já existe reunião agendada para o mesmo horário
-            conflito = False
-            for evento in st.session_state.events:
-                evento_inicio = datetime.fromisoformat(evento['start'].replace('Z', '+00:00'))
-                evento_fim = datetime.fromisoformat(evento['end'].replace('Z', '+00:00'))
-                
-                if (inicio_dt >= evento_inicio and inicio_dt < evento_fim) or \
-                   (fim_dt > evento_inicio and fim_dt <= evento_fim) or \
-                   (inicio_dt <= evento_inicio and fim_dt >= evento_fim):
-                    conflito = True
-                    st.error(f"""Conflito de horário detectado:
-                             \nReunião: {evento['title']}
-                             \nHorário: {evento_inicio.strftime('%H:%M')} - {evento_fim.strftime('%H:%M')}""")
-                    break
+            novo_evento = {
+                "title": titulo,
+                "start": inicio_dt.isoformat(),
+                "end": fim_dt.isoformat(),
+                "departamento": departamento,
+                "participantes": participantes,
+                "description": descricao
+            }
             
-            if not conflito:
-                # Adiciona novo evento
-                novo_evento = {
-                    "title": titulo,
-                    "start": inicio_dt.isoformat(),
-                    "end": fim_dt.isoformat(),
-                    "description": f"Departamento: {departamento}\nParticipantes: {', '.join(participantes)}\n\n{descricao}"
-                }
-                
+            if repeticao != "Não repetir":
+                # Conflitos são verificados em cada ocorrência do primeiro ano
+                if salvar_recorrencia(criar_regra(novo_evento, FREQUENCIAS[repeticao], repetir_ate)) is not None:
+                    st.success("Reunião recorrente agendada com sucesso!")
+                    st.rerun()
+            # Verifica conflitos apenas com reuniões dos mesmos participantes ou do mesmo departamento
+            elif verificar_conflito(novo_evento) is None:
                 salvar_evento(novo_evento)
                 st.success("Reunião agendada com sucesso!")
                 st.rerun()
 
+# Cor de cada departamento no calendário (fixa pela posição na lista)
+PALETA_DEPARTAMENTOS = [
+    "#4D268C", "#1F77B4", "#2CA02C", "#D62728", "#9467BD", "#8C564B",
+    "#E377C2", "#7F7F7F", "#BCBD22", "#17BECF", "#FF7F0E", "#3B5B92"
+]
+cores_departamentos = {
+    departamento: PALETA_DEPARTAMENTOS[indice % len(PALETA_DEPARTAMENTOS)]
+    for indice, departamento in enumerate(departamentos)
+}
+
 # Configurações do calendário
 calendar_options = {
     "initialView": "dayGridMonth",
+    # A navegação é feita pelos filtros de mês e ano (o streamlit-calendar não
+    # informa o intervalo visível). Por isso só há visões do mês inteiro: nas
+    # visões de semana ou dia só a primeira semana do mês seria alcançável.
     "headerToolbar": {
-        "left": "prev,next today",
+        "left": "",
         "center": "title",
-        "right": "dayGridMonth,timeGridWeek,timeGridDay,listWeek"
+        "right": "dayGridMonth,listMonth"
     },
     "editable": True,
     "selectable": True,
     "locale": "pt-br",
     "eventDisplay": "block",
+    "eventColor": "#4D268C",  # Cor de eventos sem departamento conhecido
     "displayEventTime": True,
     "eventTimeFormat": {
         "hour": "2-digit",
@@ -321,7 +194,6 @@ st.markdown("""
     <style>
         .fc-event {
             border: none !important;
-            background-color: #4D268C !important;
             color: white !important;
             padding: 3px !important;
             border-radius: 3px !important;
@@ -356,58 +228,131 @@ st.markdown("""
     </style>
 """, unsafe_allow_html=True)
 
-# Exibe o calendário com os eventos
-events = st.session_state.get('events', [])
+# Período exibido no calendário e na lista de reuniões.
+# O streamlit-calendar não informa o intervalo visível, então a navegação é
+# feita por estes filtros e apenas os meses exibidos são carregados do banco.
+meses = [
+    "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
+    "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
+]
+
+# Usa o mesmo estado de sessão que a página de Controle
+if 'mes_selecionado' not in st.session_state:
+    st.session_state.mes_selecionado = meses[datetime.now().month - 1]
+if 'ano_selecionado' not in st.session_state:
+    st.session_state.ano_selecionado = datetime.now().year
+
+col_periodo1, col_periodo2 = st.columns(2)
+with col_periodo1:
+    mes_selecionado = st.selectbox(
+        "Filtrar por Mês",
+        meses,
+        index=meses.index(st.session_state.mes_selecionado),
+        key="filtro_mes",
+        on_change=lambda: setattr(st.session_state, 'mes_selecionado', meses[meses.index(st.session_state.filtro_mes)])
+    )
+with col_periodo2:
+    anos = list(range(datetime.now().year - 5, datetime.now().year + 3))
+    ano_selecionado = st.selectbox(
+        "Ano",
+        anos,
+        index=anos.index(st.session_state.ano_selecionado),
+        key="filtro_ano",
+        on_change=lambda: setattr(st.session_state, 'ano_selecionado', st.session_state.filtro_ano)
+    )
+
+mes_numero = meses.index(mes_selecionado) + 1
+
+# Intervalo visível na grade mensal: 6 semanas a partir do domingo anterior ao dia 1
+primeiro_dia = datetime(ano_selecionado, mes_numero, 1)
+inicio_visivel = primeiro_dia - timedelta(days=(primeiro_dia.weekday() + 1) % 7)
+fim_visivel = inicio_visivel + timedelta(weeks=6)
+
+# Carrega do MongoDB apenas os meses exibidos
+store = obter_store(inicio_visivel, fim_visivel)
+calendar_options["initialDate"] = primeiro_dia.date().isoformat()
+
+# Exibe o calendário com os eventos, enviando apenas id, título, horário e cor
+events = store.no_intervalo(inicio_visivel, fim_visivel)
 try:
-    calendar(events=events, options=calendar_options)
+    with medir('calendario'):
+        estado_calendario = calendar(
+            events=[evento_para_calendario(evento, cores_departamentos.get(evento.get('departamento')))
+                    for evento in events],
+            options=calendar_options,
+            key=f"calendario_{ano_selecionado}_{mes_numero}"
+        )
+
+    # Detalhes do evento clicado, lidos do store apenas quando necessário
+    clique = (estado_calendario or {}).get('eventClick')
+    if clique:
+        evento_clicado = store.obter(clique['event'].get('id'))
+        if evento_clicado is not None:
+            with st.container(border=True):
+                st.subheader(evento_clicado['title'])
+                st.caption(f"{datetime.fromisoformat(evento_clicado['start']).strftime('%d/%m/%Y %H:%M')} - "
+                           f"{datetime.fromisoformat(evento_clicado['end']).strftime('%H:%M')}")
+                st.text(descricao_completa(evento_clicado))
 except Exception as e:
     st.error(f"Erro ao carregar o calendário: {str(e)}")
     st.info("Por favor, verifique se a biblioteca streamlit-calendar está instalada corretamente")
 
+# Reuniões por página na lista e critérios de ordenação
+TAMANHO_PAGINA_REUNIOES = 10
+ORDENACOES_REUNIOES = {
+    "Data": lambda evento: evento['start'],
+    "Departamento": lambda evento: ((evento['departamento'] or '').lower(), evento['start']),
+    "Título": lambda evento: ((evento['title'] or '').lower(), evento['start']),
+}
+
 # Exibe lista de reuniões agendadas
 if events:
-    col_header1, col_header2 = st.columns([2, 1])
-    with col_header1:
-        st.header("Reuniões Agendadas")
-    with col_header2:
-        meses = [
-            "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
-            "Julho", "Agosto", "Setembro", "Outubro", "Novembro", "Dezembro"
-        ]
-        
-        # Usa o mesmo estado de sessão que a página de Controle
-        if 'mes_selecionado' not in st.session_state:
-            st.session_state.mes_selecionado = meses[datetime.now().month - 1]
-            
-        mes_selecionado = st.selectbox(
-            "Filtrar por Mês",
-            meses,
-            index=meses.index(st.session_state.mes_selecionado),
-            key="filtro_mes",
-            on_change=lambda: setattr(st.session_state, 'mes_selecionado', meses[meses.index(st.session_state.filtro_mes)])
-        )
+    st.header("Reuniões Agendadas")
     
     # Filtra eventos do mês selecionado
-    mes_numero = meses.index(mes_selecionado) + 1
-    eventos_filtrados = [
-        (idx, evento) for idx, evento in enumerate(events)
-        if datetime.fromisoformat(evento['start'].replace('Z', '+00:00')).month == mes_numero
-    ]
+    eventos_filtrados = store.por_mes(mes_numero, ano_selecionado)
     
-    # Na seção de exibição de eventos, ajuste os botões:
+    # A lista é paginada e as ações só são desenhadas para a reunião
+    # selecionada, para que o número de widgets não cresça com o mês
     if eventos_filtrados:
-        for idx, evento in eventos_filtrados:
-            with st.expander(f"{evento['title']} - {datetime.fromisoformat(evento['start'][:19]).strftime('%d/%m/%Y %H:%M')}"):
+        col_ordem, col_pagina = st.columns([3, 1])
+        with col_ordem:
+            ordem = st.selectbox("Ordenar por", list(ORDENACOES_REUNIOES), key="ordem_reunioes")
+        eventos_ordenados = sorted(eventos_filtrados, key=ORDENACOES_REUNIOES[ordem])
+        total_paginas = -(-len(eventos_ordenados) // TAMANHO_PAGINA_REUNIOES)
+        with col_pagina:
+            # A chave inclui período e ordenação: ao mudar qualquer um, volta à primeira página
+            pagina = st.number_input(f"Página (de {total_paginas})", min_value=1, max_value=total_paginas,
+                                     value=1, step=1, key=f"pagina_reunioes_{ano_selecionado}_{mes_numero}_{ordem}")
+        inicio_pagina = (pagina - 1) * TAMANHO_PAGINA_REUNIOES
+        eventos_pagina = eventos_ordenados[inicio_pagina:inicio_pagina + TAMANHO_PAGINA_REUNIOES]
+        st.caption(f"{len(eventos_ordenados)} reunião(ões) no mês; exibindo "
+                   f"{inicio_pagina + 1}-{inicio_pagina + len(eventos_pagina)}.")
+
+        rotulos = {
+            evento['id']: f"{datetime.fromisoformat(evento['start'][:19]).strftime('%d/%m/%Y %H:%M')} - "
+                          f"{evento['title']} ({evento['departamento'] or 'sem departamento'})"
+            f"{' ↻' if evento.get('regra_id') else ''}"
+            for evento in eventos_pagina
+        }
+        evento_id = st.radio("Reunião", list(rotulos), format_func=rotulos.get, index=None,
+                             key=f"reuniao_selecionada_{ano_selecionado}_{mes_numero}_{ordem}_{pagina}",
+                             label_visibility="collapsed")
+        evento = store.obter(evento_id) if evento_id else None
+
+        if evento is not None:
+            with st.container(border=True):
                 col1, col2 = st.columns(2)
                 with col1:
-                    if st.button("Editar", key=f"edit_button_{idx}"):
-                        st.session_state.editing_event = idx
+                    if st.button("Editar", key=f"edit_button_{evento_id}"):
+                        st.session_state.editing_event = evento_id
+                        st.session_state.edit_versao = evento['versao']
                         st.session_state.edit_title = evento['title']
                         st.session_state.edit_start = datetime.fromisoformat(evento['start'])
                         st.session_state.edit_end = datetime.fromisoformat(evento['end'])
-                        st.session_state.edit_description = evento['description'].split('\n\n')[1] if '\n\n' in evento['description'] else ''
-                        st.session_state.edit_dept = evento['description'].split('\n')[0].replace('Departamento: ', '')
-                        st.session_state.edit_participants = evento['description'].split('\n')[1].replace('Participantes: ', '')
+                        st.session_state.edit_description = evento['description']
+                        st.session_state.edit_dept = evento['departamento'] or ''
+                        st.session_state.edit_participants = ', '.join(evento['participantes'])
                         st.rerun()
                 
                 with col2:
@@ -415,20 +360,28 @@ if events:
                     if 'confirmar_cancelamento' not in st.session_state:
                         st.session_state.confirmar_cancelamento = {}
                     
-                    if st.button("Cancelar Reunião", key=f"cancel_button_{idx}"):
-                        st.session_state.confirmar_cancelamento[idx] = True
+                    if st.button("Cancelar Reunião", key=f"cancel_button_{evento_id}"):
+                        st.session_state.confirmar_cancelamento[evento_id] = True
                     
-                    if st.session_state.confirmar_cancelamento.get(idx, False):
-                        if st.button("Confirmar Cancelamento", key=f"confirm_cancel_{idx}"):
-                            excluir_evento(idx)
-                            st.session_state.confirmar_cancelamento.pop(idx, None)
-                            st.success("Reunião cancelada com sucesso!")
-                            st.rerun()
-                        if st.button("Desistir", key=f"desistir_cancel_{idx}"):
-                            st.session_state.confirmar_cancelamento.pop(idx, None)
+                    if st.session_state.confirmar_cancelamento.get(evento_id, False):
+                        if st.button("Confirmar Cancelamento", key=f"confirm_cancel_{evento_id}"):
+                            if excluir_evento(evento_id, evento['versao']):
+                                st.session_state.confirmar_cancelamento.pop(evento_id, None)
+                                st.success("Reunião cancelada com sucesso!")
+                                st.rerun()
+                            st.session_state.confirmar_cancelamento.pop(evento_id, None)
+                        if st.button("Desistir", key=f"desistir_cancel_{evento_id}"):
+                            st.session_state.confirmar_cancelamento.pop(evento_id, None)
                             st.rerun()
 
-                st.write(evento['description'])
+                    # Reunião recorrente: editar e cancelar acima afetam só esta ocorrência
+                    if evento.get('regra_id'):
+                        if st.button("Cancelar Série", key=f"cancel_serie_{evento_id}"):
+                            if excluir_serie(evento['regra_id'], evento['versao']):
+                                st.success("Série de reuniões cancelada com sucesso!")
+                                st.rerun()
+
+                st.write(descricao_completa(evento))
 
     # Modal de edição
     if 'editing_event' in st.session_state:
@@ -476,13 +429,18 @@ if events:
                     "title": novo_titulo,
                     "start": inicio_dt.isoformat(),
                     "end": fim_dt.isoformat(),
-                    "description": f"Departamento: {novo_dept}\nParticipantes: {novos_participantes}\n\n{nova_descricao}"
+                    "departamento": novo_dept,
+                    "participantes": separar_participantes(novos_participantes),
+                    "description": nova_descricao
                 }
                 
-                atualizar_evento(st.session_state.editing_event, evento_atualizado)
-                del st.session_state.editing_event
-                st.success("Reunião atualizada com sucesso!")
-                st.rerun()
+                if atualizar_evento(st.session_state.editing_event, evento_atualizado, st.session_state.edit_versao):
+                    del st.session_state.editing_event
+                    st.success("Reunião atualizada com sucesso!")
+                    st.rerun()
+                elif (obter_store().obter(st.session_state.editing_event) or {}).get('versao') != st.session_state.edit_versao:
+                    # A reunião mudou no banco: fecha o formulário para reabrir com os dados atuais
+                    del st.session_state.editing_event
         
         with col2:
             if st.button("Cancelar Edição", key="cancel_edit"):
@@ -539,19 +497,88 @@ st.markdown(
 
 # ...
 
+# Importação e exportação de reuniões (CSV ou iCalendar)
+with st.sidebar:
+    st.divider()
+    st.subheader("Importar / Exportar")
+    with st.expander("Importar reuniões"):
+        arquivo = st.file_uploader("Arquivo CSV ou .ics", type=['csv', 'ics'], key='arquivo_importacao')
+        st.caption("CSV com as colunas titulo, inicio, fim, departamento, participantes (separados por ;) "
+                   "e descricao. Reuniões com departamento desconhecido ou conflito de horário são ignoradas.")
+        if arquivo is not None and st.button("Importar"):
+            # O arquivo é lido linha a linha; as reuniões são gravadas em lotes
+            linhas = io.TextIOWrapper(arquivo, encoding='utf-8-sig', newline='')
+            leitor = ler_ics if arquivo.name.lower().endswith('.ics') else ler_csv
+            with st.spinner("Importando..."):
+                importados, total_rejeitados, rejeitados = importar_eventos(leitor(linhas), departamentos)
+            st.success(f"{importados} reunião(ões) importada(s).")
+            if total_rejeitados:
+                st.warning(f"{total_rejeitados} reunião(ões) não importada(s).")
+                st.dataframe([{'Linha': numero, 'Título': titulo, 'Motivo': motivo}
+                              for numero, titulo, motivo in rejeitados],
+                             hide_index=True, use_container_width=True)
+    with st.expander("Exportar reuniões"):
+        hoje = datetime.now().date()
+        exportar_de = st.date_input("De", value=hoje.replace(day=1), key='exportar_de')
+        exportar_ate = st.date_input("Até", value=hoje.replace(month=12, day=31), key='exportar_ate')
+        exportar_departamento = st.selectbox("Departamento", ["Todos"] + departamentos, key='exportar_departamento')
+        formato = st.radio("Formato", ["CSV", "iCalendar"], horizontal=True, key='exportar_formato')
+        if st.button("Gerar arquivo"):
+            eventos = eventos_para_exportacao(
+                datetime.combine(exportar_de, datetime.min.time()),
+                datetime.combine(exportar_ate + timedelta(days=1), datetime.min.time()),
+                None if exportar_departamento == "Todos" else exportar_departamento
+            )
+            if formato == "CSV":
+                conteudo, nome, tipo = ''.join(linhas_csv(eventos)), 'reunioes.csv', 'text/csv'
+            else:
+                conteudo, nome, tipo = ''.join(linhas_ics(eventos)), 'reunioes.ics', 'text/calendar'
+            st.download_button("Baixar arquivo", conteudo.encode('utf-8'), file_name=nome, mime=tipo)
+
 # Adicione este código na sidebar ou em outra parte da interface
 with st.sidebar:
     st.divider()
     st.subheader("Ferramentas de Diagnóstico")
-    if st.button("Testar Conexão com MongoDB"):
-        db = get_database()
-        if db:
+    if TIPO_ARMAZENAMENTO == 'sqlite':
+        if st.button("Testar Banco de Dados Local"):
+            try:
+                st.success(f"Usando SQLite local ({CAMINHO_SQLITE}). "
+                           f"Existem {obter_armazenamento().contar()} eventos no banco de dados.")
+            except Exception as e:
+                st.error(f"Erro ao acessar o banco de dados local: {str(e)}")
+    elif st.button("Testar Conexão com MongoDB"):
+        status = verificar_conexao()
+        if status['ok']:
             try:
                 # Tenta fazer uma operação simples
-                collection = db['eventos']
-                count = collection.count_documents({})
-                st.success(f"Conexão bem-sucedida! Existem {count} eventos no banco de dados.")
+                count = obter_armazenamento().contar()
+                st.success(f"Conexão bem-sucedida ({status['origem']}, {status['latencia_ms']:.0f} ms)! "
+                           f"Existem {count} eventos no banco de dados.")
+                st.caption(f"Pool: até {status['pool']['max_pool_size']} conexões, "
+                           f"timeout de seleção {status['pool']['server_selection_timeout_ms']} ms")
             except Exception as e:
                 st.error(f"Erro ao acessar a coleção: {str(e)}")
         else:
-            st.error("Não foi possível estabelecer conexão com o MongoDB.")
\ No newline at end of file
+            st.error(f"Não foi possível estabelecer conexão com o MongoDB: {status['erro']}")
+            if status['circuito'] == 'aberto':
+                st.caption("Usando os dados locais; a conexão é tentada novamente em segundo plano.")
+
+    # Percentis das últimas execuções de cada fase (todas as sessões do processo)
+    with st.expander("Tempos por fase (ms)"):
+        resumo = metricas.resumo()
+        if resumo:
+            st.dataframe(
+                [{'Fase': fase, 'p50': round(dados['p50'], 1), 'p90': round(dados['p90'], 1),
+                  'p99': round(dados['p99'], 1), 'Máx.': round(dados['max'], 1), 'Amostras': dados['amostras']}
+                 for fase, dados in resumo.items()],
+                hide_index=True, use_container_width=True
+            )
+        else:
+            st.caption("Nenhuma medição registrada ainda.")
+        col_prom, col_json = st.columns(2)
+        with col_prom:
+            if st.button("Exportar Prometheus"):
+                st.success(f"Métricas gravadas em {metricas.exportar('prometheus')}")
+        with col_json:
+            if st.button("Exportar JSON"):
+                st.success(f"Métricas gravadas em {metricas.exportar('json')}")
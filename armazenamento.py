@@ -0,0 +1,540 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import wraps
+from pymongo import ASCENDING, ReturnDocument, UpdateOne, ReplaceOne, DeleteOne
+from pymongo.errors import ConnectionFailure
+from persistencia import (
+    INSERIR, ATUALIZAR, EXCLUIR, aplicar_operacoes, aplicar_com_resultados, ids_em_conflito, buscar_evento,
+    documento_para_evento, evento_para_documento, _para_object_id
+)
+from esquema import migrar_colecao
+from repositorio_eventos import chave_mes
+
+# Armazenamento dos eventos. As duas implementações oferecem as mesmas
+# operações, com datas no formato ISO de esquema.py:
+#   preparar(eventos_iniciais)         -> índices, migração e carga inicial
+#   carregar(inicio, fim)              -> eventos que começam em [inicio, fim)
+#   buscar(evento_id)                  -> um evento ou regra (ou None)
+#   regras()                           -> regras de reuniões recorrentes (recorrencia.py)
+# A consulta por data devolve só eventos simples; as regras são lidas à parte
+# e expandidas pelo cache.
+#   aplicar(operacoes)                 -> grava operações de persistencia.py; ids em conflito
+#   reproduzir(registros)              -> aplica registros do diário local; ids em conflito
+#   contar(), ler_token(), incrementar_token()
+# Também mantêm o resumo 'cobertura_mensal' (reuniões por departamento e mês de
+# início, sem as regras recorrentes), atualizado a cada gravação:
+#   cobertura(ano_inicio, ano_fim)     -> [(departamento, ano, mes, quantidade)]
+#   reconstruir_cobertura()            -> recalcula o resumo a partir dos eventos
+
+# Tipo de armazenamento: 'mongodb' (padrão) ou 'sqlite'
+TIPO_ARMAZENAMENTO = os.environ.get('ALFREDO_ARMAZENAMENTO', 'mongodb').lower()
+
+# Arquivo do banco SQLite local
+CAMINHO_SQLITE = os.environ.get(
+    'ALFREDO_SQLITE',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'alfredo.sqlite3')
+)
+
+# Intervalo (segundos) entre recálculos completos do resumo de cobertura no
+# MongoDB, feitos em segundo plano, que corrigem desvios deixados por gravações
+# interrompidas (0 desativa; 'python cobertura.py --reconstruir' faz o mesmo)
+INTERVALO_REPARO_COBERTURA = float(os.environ.get('ALFREDO_COBERTURA_REPARO', 3600))
+
+# Campos lidos do MongoDB; qualquer outro campo dos documentos é descartado
+PROJECAO_EVENTOS = {campo: 1 for campo in
+                    ('title', 'start', 'end', 'departamento', 'participantes', 'description', 'versao',
+                     'recorrencia')}
+
+
+# Confere o estado final após reproduzir o diário: o que não ficou como o
+# diário pede está em conflito ('versoes' é id -> versão atual)
+def _conflitos_reproducao(registros, versoes):
+    conflitos = []
+    for registro in registros:
+        evento = registro['evento']
+        if registro['tipo'] == EXCLUIR:
+            if evento['id'] in versoes:
+                conflitos.append(evento['id'])
+        elif versoes.get(evento['id']) != evento['versao']:
+            conflitos.append(evento['id'])
+    return conflitos
+
+
+# Chave (departamento, ano, mês) do evento no resumo de cobertura, ou None
+# para regras recorrentes e eventos sem departamento
+def _chave_cobertura(evento):
+    if not evento or evento.get('recorrencia') or not evento.get('departamento'):
+        return None
+    mes = chave_mes(evento)
+    return (evento['departamento'], *mes) if mes else None
+
+
+# Variação do resumo de cobertura causada pelas operações aplicadas.
+# 'antes' é id -> evento no banco antes da gravação; 'aplicadas' diz, para cada
+# operação, se ela foi aplicada (as demais são ignoradas).
+def _variacao_cobertura(operacoes, antes, aplicadas):
+    estado = {evento_id: _chave_cobertura(evento) for evento_id, evento in antes.items()}
+    variacao = {}
+    for (tipo, evento), aplicada in zip(operacoes, aplicadas):
+        if not aplicada:
+            continue
+        anterior = estado.get(evento['id'])
+        atual = None if tipo == EXCLUIR else _chave_cobertura(evento)
+        if anterior == atual:
+            continue
+        if anterior:
+            variacao[anterior] = variacao.get(anterior, 0) - 1
+        if atual:
+            variacao[atual] = variacao.get(atual, 0) + 1
+        estado[evento['id']] = atual
+    return {chave: quantidade for chave, quantidade in variacao.items() if quantidade}
+
+
+# Repassa erros de rede do MongoDB para 'ao_falhar' (o disjuntor de conexao.py),
+# para que as próximas chamadas não esperem o timeout novamente
+def _vigiado(metodo):
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        try:
+            return metodo(self, *args, **kwargs)
+        except ConnectionFailure as erro:
+            if self._ao_falhar is not None:
+                self._ao_falhar(erro)
+            raise
+    return envoltorio
+
+
+class ArmazenamentoMongo:
+    """
+    Eventos na coleção 'eventos' do MongoDB; token de versão em 'metadados'.
+
+    O resumo fica na coleção 'cobertura_mensal', um documento por departamento
+    e mês, atualizado com $inc depois de cada gravação, a partir do resultado
+    de cada operação. Se a gravação falhar no meio, as operações vão para o
+    diário e a reprodução recalcula o resumo inteiro; além disso,
+    reparar_cobertura_periodicamente() o recalcula em segundo plano. Erros de rede são
+    informados a 'ao_falhar' antes de serem propagados.
+    """
+
+    nome = 'MongoDB'
+
+    def __init__(self, db, ao_falhar=None):
+        self.db = db
+        self._ao_falhar = ao_falhar
+        self.collection = db['eventos']
+        self.cobertura_mensal = db['cobertura_mensal']
+
+    @_vigiado
+    def preparar(self, eventos_iniciais):
+        self.collection.create_index([('start', ASCENDING), ('end', ASCENDING)], name='start_end')
+        self.collection.create_index([('departamento', ASCENDING), ('start', ASCENDING)], name='departamento_start')
+        self.collection.create_index([('participantes', ASCENDING), ('start', ASCENDING)], name='participantes_start')
+        self.collection.create_index([('recorrencia.regra', ASCENDING)], name='recorrencia', sparse=True)
+        migrar_colecao(self.collection)
+        if self.collection.estimated_document_count() == 0:
+            aplicar_operacoes(self.collection, [(INSERIR, evento) for evento in eventos_iniciais])
+        self.cobertura_mensal.create_index([('ano', ASCENDING)], name='ano')
+        if self.cobertura_mensal.estimated_document_count() == 0:
+            # Bancos criados antes do resumo de cobertura
+            self.reconstruir_cobertura()
+
+    def _buscar_varios(self, filtro):
+        filtro = {**filtro, 'recorrencia': {'$exists': False}}
+        cursor = self.collection.find(filtro, PROJECAO_EVENTOS).sort('start', ASCENDING)
+        return [documento_para_evento(documento) for documento in cursor]
+
+    @_vigiado
+    def carregar(self, inicio, fim):
+        return self._buscar_varios({'start': {'$gte': inicio, '$lt': fim}})
+
+    @_vigiado
+    def buscar(self, evento_id):
+        return buscar_evento(self.collection, evento_id, PROJECAO_EVENTOS)
+
+    @_vigiado
+    def regras(self):
+        cursor = self.collection.find({'recorrencia': {'$exists': True}}, PROJECAO_EVENTOS)
+        return [documento_para_evento(documento) for documento in cursor]
+
+    def _estado_atual(self, ids):
+        ids = [_para_object_id(evento_id) for evento_id in set(ids)]
+        if not ids:
+            return {}
+        cursor = self.collection.find({'_id': {'$in': ids}},
+                                      {'start': 1, 'departamento': 1, 'versao': 1, 'recorrencia': 1})
+        return {str(documento['_id']): {**documento, 'id': str(documento['_id'])} for documento in cursor}
+
+    def _atualizar_cobertura(self, variacao):
+        if not variacao:
+            return
+        self.cobertura_mensal.bulk_write([
+            UpdateOne({'_id': f'{departamento}|{ano:04d}-{mes:02d}'},
+                      {'$inc': {'quantidade': quantidade},
+                       '$setOnInsert': {'departamento': departamento, 'ano': ano, 'mes': mes}},
+                      upsert=True)
+            for (departamento, ano, mes), quantidade in variacao.items()
+        ], ordered=False)
+
+    @_vigiado
+    def aplicar(self, operacoes):
+        # O estado anterior só é lido para atualizações e exclusões
+        antes = self._estado_atual(evento['id'] for tipo, evento in operacoes if tipo != INSERIR)
+        aplicadas = aplicar_com_resultados(self.collection, operacoes)
+        self._atualizar_cobertura(_variacao_cobertura(operacoes, antes, aplicadas))
+        return ids_em_conflito(operacoes, aplicadas)
+
+    @_vigiado
+    def reproduzir(self, registros):
+        operacoes = []
+        for registro in registros:
+            documento = evento_para_documento(registro['evento'])
+            filtro = {'_id': documento['_id'], 'versao': registro['base']}
+            if registro['tipo'] == INSERIR:
+                campos = {campo: valor for campo, valor in documento.items() if campo != '_id'}
+                operacoes.append(UpdateOne({'_id': documento['_id']}, {'$setOnInsert': campos}, upsert=True))
+            elif registro['tipo'] == ATUALIZAR:
+                operacoes.append(ReplaceOne(filtro, documento))
+            else:
+                operacoes.append(DeleteOne(filtro))
+        self.collection.bulk_write(operacoes, ordered=True)
+
+        ids = [_para_object_id(registro['evento']['id']) for registro in registros]
+        versoes = {str(documento['_id']): documento.get('versao')
+                   for documento in self.collection.find({'_id': {'$in': ids}}, {'versao': 1})}
+        # Não há como saber se a gravação interrompida que gerou o diário chegou a
+        # atualizar o resumo; a reprodução é rara, então o resumo é recalculado
+        self.reconstruir_cobertura()
+        return _conflitos_reproducao(registros, versoes)
+
+    @_vigiado
+    def cobertura(self, ano_inicio, ano_fim):
+        cursor = self.cobertura_mensal.find({'ano': {'$gte': ano_inicio, '$lte': ano_fim}, 'quantidade': {'$gt': 0}})
+        return [(documento['departamento'], documento['ano'], documento['mes'], documento['quantidade'])
+                for documento in cursor]
+
+    @_vigiado
+    def reconstruir_cobertura(self):
+        """Recalcula 'cobertura_mensal' a partir dos eventos. Retorna o número de documentos."""
+        grupos = self.collection.aggregate([
+            {'$match': {'recorrencia': {'$exists': False}, 'departamento': {'$nin': [None, '']}}},
+            {'$group': {'_id': {'departamento': '$departamento', 'mes': {'$substrBytes': ['$start', 0, 7]}},
+                        'quantidade': {'$sum': 1}}},
+        ])
+        documentos = [{
+            '_id': f"{grupo['_id']['departamento']}|{grupo['_id']['mes']}",
+            'departamento': grupo['_id']['departamento'],
+            'ano': int(grupo['_id']['mes'][0:4]),
+            'mes': int(grupo['_id']['mes'][5:7]),
+            'quantidade': grupo['quantidade'],
+        } for grupo in grupos]
+        # Substitui documento a documento (sem esvaziar a coleção), para não
+        # colidir com os $inc de gravações concorrentes
+        if documentos:
+            self.cobertura_mensal.bulk_write([ReplaceOne({'_id': documento['_id']}, documento, upsert=True)
+                                              for documento in documentos], ordered=False)
+        self.cobertura_mensal.delete_many({'_id': {'$nin': [documento['_id'] for documento in documentos]}})
+        return len(documentos)
+
+    def reparar_cobertura_periodicamente(self, intervalo=INTERVALO_REPARO_COBERTURA):
+        """Inicia uma thread que recalcula o resumo a cada 'intervalo' segundos, fora das requisições."""
+        if intervalo <= 0:
+            return
+
+        def executar():
+            while True:
+                time.sleep(intervalo)
+                try:
+                    self.reconstruir_cobertura()
+                except Exception:
+                    # Sem conexão: tenta de novo no próximo intervalo
+                    continue
+
+        threading.Thread(target=executar, name='alfredo-reparo-cobertura', daemon=True).start()
+
+    @_vigiado
+    def contar(self):
+        return self.collection.count_documents({})
+
+    @_vigiado
+    def ler_token(self):
+        documento = self.db['metadados'].find_one({'_id': 'eventos'})
+        return documento['versao'] if documento else 0
+
+    @_vigiado
+    def incrementar_token(self):
+        documento = self.db['metadados'].find_one_and_update(
+            {'_id': 'eventos'}, {'$inc': {'versao': 1}},
+            upsert=True, return_document=ReturnDocument.AFTER
+        )
+        return documento['versao']
+
+
+_ESQUEMA_SQLITE = """
+CREATE TABLE IF NOT EXISTS eventos (
+    id TEXT PRIMARY KEY,
+    title TEXT,
+    start TEXT NOT NULL,
+    "end" TEXT NOT NULL,
+    departamento TEXT,
+    description TEXT,
+    versao INTEGER NOT NULL DEFAULT 1,
+    recorrencia TEXT
+);
+CREATE INDEX IF NOT EXISTS eventos_start_end ON eventos (start, "end");
+CREATE INDEX IF NOT EXISTS eventos_end ON eventos ("end");
+CREATE INDEX IF NOT EXISTS eventos_departamento_start ON eventos (departamento, start);
+CREATE TABLE IF NOT EXISTS participantes (
+    evento_id TEXT NOT NULL REFERENCES eventos (id) ON DELETE CASCADE,
+    posicao INTEGER NOT NULL,
+    nome TEXT NOT NULL,
+    PRIMARY KEY (evento_id, posicao)
+);
+CREATE INDEX IF NOT EXISTS participantes_nome ON participantes (nome, evento_id);
+CREATE TABLE IF NOT EXISTS metadados (
+    chave TEXT PRIMARY KEY,
+    versao INTEGER NOT NULL
+);
+"""
+
+# Resumo de cobertura mantido por triggers, na mesma transação da gravação.
+# Como no MongoDB, eventos sem departamento (NULL ou '') não entram no resumo.
+# Os triggers são recriados a cada abertura, para atualizar bancos antigos.
+_ESQUEMA_COBERTURA_SQLITE = """
+CREATE TABLE IF NOT EXISTS cobertura_mensal (
+    departamento TEXT NOT NULL,
+    ano INTEGER NOT NULL,
+    mes INTEGER NOT NULL,
+    quantidade INTEGER NOT NULL,
+    PRIMARY KEY (departamento, ano, mes)
+);
+DROP TRIGGER IF EXISTS cobertura_inserir;
+DROP TRIGGER IF EXISTS cobertura_excluir;
+DROP TRIGGER IF EXISTS cobertura_atualizar_antes;
+DROP TRIGGER IF EXISTS cobertura_atualizar_depois;
+CREATE TRIGGER cobertura_inserir AFTER INSERT ON eventos
+WHEN NEW.recorrencia IS NULL AND NEW.departamento IS NOT NULL AND NEW.departamento <> ''
+BEGIN
+    INSERT INTO cobertura_mensal (departamento, ano, mes, quantidade)
+    VALUES (NEW.departamento, CAST(substr(NEW.start, 1, 4) AS INTEGER), CAST(substr(NEW.start, 6, 2) AS INTEGER), 1)
+    ON CONFLICT (departamento, ano, mes) DO UPDATE SET quantidade = quantidade + 1;
+END;
+CREATE TRIGGER cobertura_excluir AFTER DELETE ON eventos
+WHEN OLD.recorrencia IS NULL AND OLD.departamento IS NOT NULL AND OLD.departamento <> ''
+BEGIN
+    UPDATE cobertura_mensal SET quantidade = quantidade - 1
+    WHERE departamento = OLD.departamento AND ano = CAST(substr(OLD.start, 1, 4) AS INTEGER)
+      AND mes = CAST(substr(OLD.start, 6, 2) AS INTEGER);
+END;
+CREATE TRIGGER cobertura_atualizar_antes AFTER UPDATE OF start, departamento, recorrencia ON eventos
+WHEN OLD.recorrencia IS NULL AND OLD.departamento IS NOT NULL AND OLD.departamento <> ''
+BEGIN
+    UPDATE cobertura_mensal SET quantidade = quantidade - 1
+    WHERE departamento = OLD.departamento AND ano = CAST(substr(OLD.start, 1, 4) AS INTEGER)
+      AND mes = CAST(substr(OLD.start, 6, 2) AS INTEGER);
+END;
+CREATE TRIGGER cobertura_atualizar_depois AFTER UPDATE OF start, departamento, recorrencia ON eventos
+WHEN NEW.recorrencia IS NULL AND NEW.departamento IS NOT NULL AND NEW.departamento <> ''
+BEGIN
+    INSERT INTO cobertura_mensal (departamento, ano, mes, quantidade)
+    VALUES (NEW.departamento, CAST(substr(NEW.start, 1, 4) AS INTEGER), CAST(substr(NEW.start, 6, 2) AS INTEGER), 1)
+    ON CONFLICT (departamento, ano, mes) DO UPDATE SET quantidade = quantidade + 1;
+END;
+"""
+
+_COLUNAS_SQLITE = 'id, title, start, "end", departamento, description, versao, recorrencia'
+
+
+class ArmazenamentoSQLite:
+    """
+    Eventos em um arquivo SQLite local, para instalações sem Atlas.
+
+    Os participantes ficam em uma tabela própria, indexada por nome; os
+    eventos são indexados por início, fim e departamento. Uma única conexão
+    é compartilhada pelas sessões e pela fila de escrita, protegida por lock.
+    O resumo 'cobertura_mensal' é mantido por triggers da tabela de eventos.
+    """
+
+    nome = 'SQLite'
+
+    def __init__(self, caminho=CAMINHO_SQLITE):
+        self.caminho = caminho
+        self._lock = threading.RLock()
+        self._conexao = sqlite3.connect(caminho, check_same_thread=False)
+        self._conexao.row_factory = sqlite3.Row
+        self._conexao.execute('PRAGMA foreign_keys = ON')
+        self._conexao.execute('PRAGMA journal_mode = WAL')
+        self._conexao.executescript(_ESQUEMA_SQLITE)
+        colunas = {linha['name'] for linha in self._conexao.execute('PRAGMA table_info(eventos)')}
+        if 'recorrencia' not in colunas:
+            # Bancos criados antes das reuniões recorrentes
+            self._conexao.execute('ALTER TABLE eventos ADD COLUMN recorrencia TEXT')
+        self._conexao.execute('CREATE INDEX IF NOT EXISTS eventos_regras ON eventos (id) WHERE recorrencia IS NOT NULL')
+        sem_cobertura = self._conexao.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cobertura_mensal'").fetchone() is None
+        self._conexao.executescript(_ESQUEMA_COBERTURA_SQLITE)
+        # Linhas de departamento vazio contadas pelos triggers antigos
+        with self._conexao:
+            self._conexao.execute("DELETE FROM cobertura_mensal WHERE departamento = ''")
+        if sem_cobertura:
+            # Bancos criados antes do resumo de cobertura
+            self.reconstruir_cobertura()
+
+    def preparar(self, eventos_iniciais):
+        with self._lock:
+            vazio = self._conexao.execute('SELECT 1 FROM eventos LIMIT 1').fetchone() is None
+        if vazio:
+            self.aplicar([(INSERIR, evento) for evento in eventos_iniciais])
+
+    @staticmethod
+    def _para_evento(linha):
+        evento = {**dict(linha), 'participantes': []}
+        recorrencia = evento.pop('recorrencia')
+        if recorrencia:
+            evento['recorrencia'] = json.loads(recorrencia)
+        return evento
+
+    def _buscar_varios(self, condicao, parametros, somente_eventos=True):
+        if somente_eventos:
+            condicao = f'({condicao}) AND recorrencia IS NULL'
+        with self._lock:
+            linhas = self._conexao.execute(
+                f'SELECT {_COLUNAS_SQLITE} FROM eventos WHERE {condicao} ORDER BY start', parametros
+            ).fetchall()
+            eventos = [self._para_evento(linha) for linha in linhas]
+            if not eventos:
+                return eventos
+            por_id = {evento['id']: evento for evento in eventos}
+            todos_ids = list(por_id)
+            for inicio in range(0, len(todos_ids), 500):
+                ids = todos_ids[inicio:inicio + 500]
+                marcadores = ', '.join('?' * len(ids))
+                for linha in self._conexao.execute(
+                        f'SELECT evento_id, nome FROM participantes WHERE evento_id IN ({marcadores}) '
+                        'ORDER BY evento_id, posicao', ids):
+                    por_id[linha['evento_id']]['participantes'].append(linha['nome'])
+        return eventos
+
+    def carregar(self, inicio, fim):
+        return self._buscar_varios('start >= ? AND start < ?', (inicio, fim))
+
+    def buscar(self, evento_id):
+        eventos = self._buscar_varios('id = ?', (evento_id,), somente_eventos=False)
+        return eventos[0] if eventos else None
+
+    def regras(self):
+        return self._buscar_varios('recorrencia IS NOT NULL', (), somente_eventos=False)
+
+    @staticmethod
+    def _recorrencia(evento):
+        return json.dumps(evento['recorrencia'], ensure_ascii=False) if evento.get('recorrencia') else None
+
+    def _inserir(self, evento, ignorar_existente=False):
+        comando = 'INSERT OR IGNORE' if ignorar_existente else 'INSERT'
+        cursor = self._conexao.execute(
+            f'{comando} INTO eventos ({_COLUNAS_SQLITE}) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+            (evento['id'], evento.get('title'), evento['start'], evento['end'],
+             evento.get('departamento'), evento.get('description'), evento.get('versao', 1),
+             self._recorrencia(evento))
+        )
+        if cursor.rowcount:
+            self._gravar_participantes(evento)
+
+    def _substituir(self, evento, versao_base):
+        cursor = self._conexao.execute(
+            'UPDATE eventos SET title = ?, start = ?, "end" = ?, departamento = ?, description = ?, versao = ?, '
+            'recorrencia = ? WHERE id = ? AND versao = ?',
+            (evento.get('title'), evento['start'], evento['end'], evento.get('departamento'),
+             evento.get('description'), evento['versao'], self._recorrencia(evento), evento['id'], versao_base)
+        )
+        if cursor.rowcount:
+            self._conexao.execute('DELETE FROM participantes WHERE evento_id = ?', (evento['id'],))
+            self._gravar_participantes(evento)
+        return cursor.rowcount
+
+    def _excluir(self, evento_id, versao_base):
+        return self._conexao.execute('DELETE FROM eventos WHERE id = ? AND versao = ?',
+                                     (evento_id, versao_base)).rowcount
+
+    def _gravar_participantes(self, evento):
+        self._conexao.executemany(
+            'INSERT INTO participantes (evento_id, posicao, nome) VALUES (?, ?, ?)',
+            [(evento['id'], posicao, nome) for posicao, nome in enumerate(evento.get('participantes') or [])]
+        )
+
+    def aplicar(self, operacoes):
+        """Mesma semântica de persistencia.aplicar_operacoes, em uma única transação."""
+        conflitos = []
+        with self._lock, self._conexao:
+            for tipo, evento in operacoes:
+                if tipo == INSERIR:
+                    self._inserir(evento)
+                elif tipo == ATUALIZAR:
+                    if not self._substituir(evento, evento['versao'] - 1):
+                        conflitos.append(evento['id'])
+                elif tipo == EXCLUIR:
+                    if not self._excluir(evento['id'], evento['versao']):
+                        conflitos.append(evento['id'])
+                else:
+                    raise ValueError(f"Tipo de operação desconhecido: {tipo}")
+        return conflitos
+
+    def reproduzir(self, registros):
+        with self._lock, self._conexao:
+            for registro in registros:
+                evento = registro['evento']
+                if registro['tipo'] == INSERIR:
+                    self._inserir(evento, ignorar_existente=True)
+                elif registro['tipo'] == ATUALIZAR:
+                    self._substituir(evento, registro['base'])
+                else:
+                    self._excluir(evento['id'], registro['base'])
+            ids = [registro['evento']['id'] for registro in registros]
+            versoes = {}
+            for inicio in range(0, len(ids), 500):
+                parte = ids[inicio:inicio + 500]
+                marcadores = ', '.join('?' * len(parte))
+                versoes.update(self._conexao.execute(
+                    f'SELECT id, versao FROM eventos WHERE id IN ({marcadores})', parte
+                ).fetchall())
+        return _conflitos_reproducao(registros, versoes)
+
+    def cobertura(self, ano_inicio, ano_fim):
+        with self._lock:
+            return [tuple(linha) for linha in self._conexao.execute(
+                'SELECT departamento, ano, mes, quantidade FROM cobertura_mensal '
+                'WHERE ano BETWEEN ? AND ? AND quantidade > 0', (ano_inicio, ano_fim))]
+
+    def reconstruir_cobertura(self):
+        """Recalcula 'cobertura_mensal' a partir dos eventos. Retorna o número de linhas."""
+        with self._lock, self._conexao:
+            self._conexao.execute('DELETE FROM cobertura_mensal')
+            return self._conexao.execute(
+                'INSERT INTO cobertura_mensal (departamento, ano, mes, quantidade) '
+                'SELECT departamento, CAST(substr(start, 1, 4) AS INTEGER), CAST(substr(start, 6, 2) AS INTEGER), '
+                "COUNT(*) FROM eventos WHERE recorrencia IS NULL AND departamento IS NOT NULL AND departamento <> '' "
+                'GROUP BY 1, 2, 3'
+            ).rowcount
+
+    def fechar(self):
+        with self._lock:
+            self._conexao.close()
+
+    def contar(self):
+        with self._lock:
+            return self._conexao.execute('SELECT COUNT(*) FROM eventos').fetchone()[0]
+
+    def ler_token(self):
+        with self._lock:
+            linha = self._conexao.execute("SELECT versao FROM metadados WHERE chave = 'eventos'").fetchone()
+        return linha[0] if linha else 0
+
+    def incrementar_token(self):
+        with self._lock, self._conexao:
+            self._conexao.execute(
+                "INSERT INTO metadados (chave, versao) VALUES ('eventos', 1) "
+                "ON CONFLICT (chave) DO UPDATE SET versao = versao + 1"
+            )
+            return self._conexao.execute("SELECT versao FROM metadados WHERE chave = 'eventos'").fetchone()[0]
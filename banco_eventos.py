@@ -1,22 +1,22 @@
 eventos_db = [
-    {'title': '[ORÇAMENTO 2025] CSA DV', 'start': '2025-05-12T14:00:00', 'end': '2025-05-12T15:00:00', 'description': 'Departamento: CSA - DV\nParticipantes: Karla Camargos Souza, Taianny Souza Pinto\n\nReunião de acompanhamento do reeal x orçado da unidade.'},
-    {'title': '[ORÇAMENTO 2025] Contabilidade', 'start': '2025-05-13T09:00:00', 'end': '2025-05-13T09:30:00', 'description': 'Departamento: Contabilidade\nParticipantes: Juliana Silva Casagrande\n\nReunião de acompanhamento do reeal x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] CSA BH', 'start': '2025-05-13T09:00:00', 'end': '2025-05-13T10:00:00', 'description': 'Departamento: CSA - BH\nParticipantes: Mauro Pereces Macedo, Douglas Leite\n\nReunião de acompanhamento do reeal x orçado da unidade.'},
-    {'title': '[ORÇAMENTO 2025] Gestão de Documentos', 'start': '2025-05-12T16:00:00', 'end': '2025-05-12T16:30:00', 'description': 'Departamento: Gestão de Documentos\nParticipantes: Miryam Laila Ferreira\n\nReunião de acompanhamento do reeal x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] CSA NL', 'start': '2025-05-14T09:00:00', 'end': '2025-05-14T10:00:00', 'description': 'Departamento: CSA - NL\nParticipantes: Fabricio de Paula Martins\n\nReunião de acompanhamento do reeal x orçado da unidade.'},
-    {'title': '[ORÇAMENTO 2025] CSA GZ', 'start': '2025-05-14T14:30:00', 'end': '2025-05-14T15:30:00', 'description': 'Departamento: CSA - GZ\nParticipantes: Jaqueline Andrade Fonseca\n\nReunião de acompanhamento do reeal x orçado da unidade.'},
-    {'title': '[ORÇAMENTO 2025] CSA CTG', 'start': '2025-05-15T09:00:00', 'end': '2025-05-15T10:00:00', 'description': 'Departamento: CSA - CTG\nParticipantes: Eduardo dos Santos Lopes, Pablo Ronam João\n\nReunião de acompanhamento do reeal x orçado da unidade.'},
-    {'title': '[ORÇAMENTO 2025] Jurídico', 'start': '2025-05-15T10:30:00', 'end': '2025-05-15T11:00:00', 'description': 'Departamento: Assessoria Jurídica\nParticipantes: Leila Oliveira, Rafael Coelho Ferreira\n\nReunião de acompanhamento do reeal x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Financeiro', 'start': '2025-05-16T11:00:00', 'end': '2025-05-16T11:30:00', 'description': 'Departamento: Financeiro\nParticipantes: Julliana Cristina Bertoni, Amanda Macedo Fernandes\n\nReunião de acompanhamento do reeal x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Assistência Social', 'start': '2025-05-19T10:00:00', 'end': '2025-05-19T10:30:00', 'description': 'Departamento: Assistência Social\nParticipantes: Dayse Araújo Dutra\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Departamento Pessoal', 'start': '2025-05-20T09:00:00', 'end': '2025-05-20T10:00:00', 'description': 'Departamento: Departamento de Pessoal\nParticipantes: Karinne Dias, Diego Dias da Cruz\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Recursos Humanos', 'start': '2025-05-20T14:00:00', 'end': '2025-05-20T15:00:00', 'description': 'Departamento: Recursos Humanos\nParticipantes: Matheus Tine\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Comunicação', 'start': '2025-05-20T16:00:00', 'end': '2025-05-20T17:00:00', 'description': 'Departamento: Comunicação e Marketing\nParticipantes: Ana Rita Duarte de Faria, Aline Marian Duarte\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Sustentabilidade', 'start': '2025-05-21T09:00:00', 'end': '2025-05-21T09:30:00', 'description': 'Departamento: Sustentabilidade\nParticipantes: Marcela Poeiras\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Estratégia e Novos Negócios', 'start': '2025-05-21T16:30:00', 'end': '2025-05-21T17:00:00', 'description': 'Departamento: Estratégia e Novos Negócios\nParticipantes: Rodrigo Mourão\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] TI', 'start': '2025-05-22T10:00:00', 'end': '2025-05-22T11:00:00', 'description': 'Departamento: Tecnologia da Informação\nParticipantes: Hudson Oliveira Leite, Ricardo Frederico Gouveia, Luciana Alves Faria\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Internacionalização', 'start': '2025-05-23T10:00:00', 'end': '2025-05-23T10:30:00', 'description': 'Departamento: Internacionalização\nParticipantes: Clarissa Felix Azevedo\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Coord. Manutenção', 'start': '2025-05-27T09:00:00', 'end': '2025-05-27T09:30:00', 'description': 'Departamento: Coordenação de Manutenção\nParticipantes: Ricardo Augusto Loureiro\n\nReunião mensal de acompanhamento do orçamento.'},
-    {'title': '[ORÇAMENTO 2025] Secretaria', 'start': '2025-05-23T15:00:00', 'end': '2025-05-23T15:30:00', 'description': 'Departamento: Secretaria\nParticipantes: Nubia Paula Las Casas\n\nReunião mensal de acompanhamento do real x orçado da área.'},
-    {'title': '[ORÇAMENTO 2025] Pastoralidade', 'start': '2025-05-20T15:00:00', 'end': '2025-05-20T15:30:00', 'description': 'Departamento: Pastoralidade\nParticipantes: Jonathan Felix de Souza\n\nReunião de acompanhamento do real x orçado da área'}
+    {'title': '[ORÇAMENTO 2025] CSA DV', 'start': '2025-05-12T14:00:00', 'end': '2025-05-12T15:00:00', 'departamento': 'CSA - DV', 'participantes': ['Karla Camargos Souza', 'Taianny Souza Pinto'], 'description': 'Reunião de acompanhamento do reeal x orçado da unidade.'},
+    {'title': '[ORÇAMENTO 2025] Contabilidade', 'start': '2025-05-13T09:00:00', 'end': '2025-05-13T09:30:00', 'departamento': 'Contabilidade', 'participantes': ['Juliana Silva Casagrande'], 'description': 'Reunião de acompanhamento do reeal x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] CSA BH', 'start': '2025-05-13T09:00:00', 'end': '2025-05-13T10:00:00', 'departamento': 'CSA - BH', 'participantes': ['Mauro Pereces Macedo', 'Douglas Leite'], 'description': 'Reunião de acompanhamento do reeal x orçado da unidade.'},
+    {'title': '[ORÇAMENTO 2025] Gestão de Documentos', 'start': '2025-05-12T16:00:00', 'end': '2025-05-12T16:30:00', 'departamento': 'Gestão de Documentos', 'participantes': ['Miryam Laila Ferreira'], 'description': 'Reunião de acompanhamento do reeal x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] CSA NL', 'start': '2025-05-14T09:00:00', 'end': '2025-05-14T10:00:00', 'departamento': 'CSA - NL', 'participantes': ['Fabricio de Paula Martins'], 'description': 'Reunião de acompanhamento do reeal x orçado da unidade.'},
+    {'title': '[ORÇAMENTO 2025] CSA GZ', 'start': '2025-05-14T14:30:00', 'end': '2025-05-14T15:30:00', 'departamento': 'CSA - GZ', 'participantes': ['Jaqueline Andrade Fonseca'], 'description': 'Reunião de acompanhamento do reeal x orçado da unidade.'},
+    {'title': '[ORÇAMENTO 2025] CSA CTG', 'start': '2025-05-15T09:00:00', 'end': '2025-05-15T10:00:00', 'departamento': 'CSA - CTG', 'participantes': ['Eduardo dos Santos Lopes', 'Pablo Ronam João'], 'description': 'Reunião de acompanhamento do reeal x orçado da unidade.'},
+    {'title': '[ORÇAMENTO 2025] Jurídico', 'start': '2025-05-15T10:30:00', 'end': '2025-05-15T11:00:00', 'departamento': 'Assessoria Jurídica', 'participantes': ['Leila Oliveira', 'Rafael Coelho Ferreira'], 'description': 'Reunião de acompanhamento do reeal x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Financeiro', 'start': '2025-05-16T11:00:00', 'end': '2025-05-16T11:30:00', 'departamento': 'Financeiro', 'participantes': ['Julliana Cristina Bertoni', 'Amanda Macedo Fernandes'], 'description': 'Reunião de acompanhamento do reeal x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Assistência Social', 'start': '2025-05-19T10:00:00', 'end': '2025-05-19T10:30:00', 'departamento': 'Assistência Social', 'participantes': ['Dayse Araújo Dutra'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Departamento Pessoal', 'start': '2025-05-20T09:00:00', 'end': '2025-05-20T10:00:00', 'departamento': 'Departamento de Pessoal', 'participantes': ['Karinne Dias', 'Diego Dias da Cruz'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Recursos Humanos', 'start': '2025-05-20T14:00:00', 'end': '2025-05-20T15:00:00', 'departamento': 'Recursos Humanos', 'participantes': ['Matheus Tine'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Comunicação', 'start': '2025-05-20T16:00:00', 'end': '2025-05-20T17:00:00', 'departamento': 'Comunicação e Marketing', 'participantes': ['Ana Rita Duarte de Faria', 'Aline Marian Duarte'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Sustentabilidade', 'start': '2025-05-21T09:00:00', 'end': '2025-05-21T09:30:00', 'departamento': 'Sustentabilidade', 'participantes': ['Marcela Poeiras'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Estratégia e Novos Negócios', 'start': '2025-05-21T16:30:00', 'end': '2025-05-21T17:00:00', 'departamento': 'Estratégia e Novos Negócios', 'participantes': ['Rodrigo Mourão'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] TI', 'start': '2025-05-22T10:00:00', 'end': '2025-05-22T11:00:00', 'departamento': 'Tecnologia da Informação', 'participantes': ['Hudson Oliveira Leite', 'Ricardo Frederico Gouveia', 'Luciana Alves Faria'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Internacionalização', 'start': '2025-05-23T10:00:00', 'end': '2025-05-23T10:30:00', 'departamento': 'Internacionalização', 'participantes': ['Clarissa Felix Azevedo'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Coord. Manutenção', 'start': '2025-05-27T09:00:00', 'end': '2025-05-27T09:30:00', 'departamento': 'Coordenação de Manutenção', 'participantes': ['Ricardo Augusto Loureiro'], 'description': 'Reunião mensal de acompanhamento do orçamento.'},
+    {'title': '[ORÇAMENTO 2025] Secretaria', 'start': '2025-05-23T15:00:00', 'end': '2025-05-23T15:30:00', 'departamento': 'Secretaria', 'participantes': ['Nubia Paula Las Casas'], 'description': 'Reunião mensal de acompanhamento do real x orçado da área.'},
+    {'title': '[ORÇAMENTO 2025] Pastoralidade', 'start': '2025-05-20T15:00:00', 'end': '2025-05-20T15:30:00', 'departamento': 'Pastoralidade', 'participantes': ['Jonathan Felix de Souza'], 'description': 'Reunião de acompanhamento do real x orçado da área'}
 ]
\ No newline at end of file
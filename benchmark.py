@@ -0,0 +1,208 @@
+"""
+Benchmark com carga sintética.
+
+Gera eventos no formato de banco_eventos.py, usando os departamentos e
+colaboradores reais, e mede os caminhos de agendamento e de controle:
+
+    python benchmark.py --tamanhos 1000 10000 100000 --saida bench.json
+    python benchmark.py --tamanhos 1000000 --repeticoes 1
+    python benchmark.py --comparar bench.json
+
+O resultado é um JSON (uma medição por tamanho e operação, em ms) que pode
+ser comparado entre versões com --comparar.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from departamentos import departamentos
+from repositorio_eventos import EventStore
+from cobertura import matriz_da_tabela, percentual_mensal
+from tabela_eventos import TabelaEventos
+from persistencia import INSERIR
+from armazenamento import ArmazenamentoSQLite
+from referencia import dados_padrao
+
+TAMANHOS_PADRAO = [1000, 10000, 100000]
+REPETICOES_PADRAO = 5
+# Amostras por repetição nas operações pontuais (conflito, filtro por mês)
+AMOSTRAS = 200
+# Reuniões por dia útil na carga sintética
+REUNIOES_POR_DIA = 20
+DURACOES_MINUTOS = (30, 60, 90)
+
+
+def gerar_eventos(quantidade, semente=0, inicio=datetime(2020, 1, 1)):
+    """
+    Gera 'quantidade' eventos sintéticos, REUNIOES_POR_DIA por dia útil a
+    partir de 'inicio', entre 08:00 e 18:00, com participantes do departamento.
+    """
+    aleatorio = random.Random(semente)
+    colaboradores_do_departamento = dados_padrao().colaboradores_do_departamento
+    eventos = []
+    dia = inicio
+    while len(eventos) < quantidade:
+        if dia.weekday() < 5:
+            for _ in range(min(REUNIOES_POR_DIA, quantidade - len(eventos))):
+                departamento = aleatorio.choice(departamentos)
+                nomes = colaboradores_do_departamento(departamento)
+                comeco = dia + timedelta(hours=8, minutes=30 * aleatorio.randrange(18))
+                fim = comeco + timedelta(minutes=aleatorio.choice(DURACOES_MINUTOS))
+                eventos.append({
+                    'id': f"{len(eventos):024x}",
+                    'title': f"[ORÇAMENTO {dia.year}] {departamento}",
+                    'start': comeco.isoformat(timespec='seconds'),
+                    'end': fim.isoformat(timespec='seconds'),
+                    'departamento': departamento,
+                    'participantes': aleatorio.sample(nomes, min(len(nomes), aleatorio.randint(1, 2))),
+                    'description': 'Reunião mensal de acompanhamento do real x orçado da área.',
+                    'versao': 1,
+                })
+        dia += timedelta(days=1)
+    return eventos
+
+
+def medir(funcao, repeticoes):
+    """Executa 'funcao' (que pode preparar o próprio estado) e devolve os tempos em ms."""
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append((time.perf_counter() - inicio) * 1000)
+    return tempos
+
+
+def _meses(eventos):
+    return sorted({(int(evento['start'][:4]), int(evento['start'][5:7])) for evento in eventos})
+
+
+def executar(tamanho, repeticoes, semente=0):
+    """Mede todas as operações para um tamanho de carga. Retorna {operacao: tempos}."""
+    eventos = gerar_eventos(tamanho, semente)
+    aleatorio = random.Random(semente + 1)
+    meses = _meses(eventos)
+    candidatos = [aleatorio.choice(eventos) for _ in range(AMOSTRAS)]
+    medicoes = {}
+
+    medicoes['carregar_store'] = medir(lambda: EventStore(eventos), repeticoes)
+    store = EventStore(eventos)
+
+    medicoes['montar_tabela'] = medir(lambda: TabelaEventos(eventos), repeticoes)
+    store.tabela()
+
+    serializado = json.dumps(eventos, ensure_ascii=False)
+    medicoes['serializar_json'] = medir(lambda: json.dumps(eventos, ensure_ascii=False), repeticoes)
+    medicoes['desserializar_json'] = medir(lambda: json.loads(serializado), repeticoes)
+
+    # Conflito como no formulário de agendamento: mesmo horário, participantes e departamento
+    def verificar_conflitos():
+        for evento in candidatos:
+            store.conflitos(evento['start'], evento['end'],
+                            participantes=evento['participantes'], departamento=evento['departamento'])
+    medicoes[f'verificar_conflito_x{AMOSTRAS}'] = medir(verificar_conflitos, repeticoes)
+
+    def filtrar_meses():
+        for _ in range(AMOSTRAS):
+            ano, mes = aleatorio.choice(meses)
+            store.por_mes(mes, ano)
+    medicoes[f'filtrar_mes_x{AMOSTRAS}'] = medir(filtrar_meses, repeticoes)
+
+    ano = meses[-1][0]
+    medicoes['calcular_percentual_mensal'] = medir(
+        lambda: percentual_mensal(matriz_da_tabela(store.tabela(), departamentos), ano), repeticoes
+    )
+
+    # Gravação completa e leitura de um mês no SQLite local (arquivo novo a cada repetição)
+    with tempfile.TemporaryDirectory() as pasta:
+        caminhos = iter(os.path.join(pasta, f"bench_{i}.sqlite3") for i in range(repeticoes))
+        operacoes = [(INSERIR, evento) for evento in eventos]
+
+        def salvar_completo():
+            armazenamento = ArmazenamentoSQLite(next(caminhos))
+            armazenamento.aplicar(operacoes)
+            armazenamento.fechar()
+        medicoes['salvar_completo_sqlite'] = medir(salvar_completo, repeticoes)
+
+        armazenamento = ArmazenamentoSQLite(os.path.join(pasta, 'bench_0.sqlite3'))
+        ano, mes = meses[len(meses) // 2]
+        inicio = datetime(ano, mes, 1)
+        fim = datetime(ano + 1, 1, 1) if mes == 12 else datetime(ano, mes + 1, 1)
+        medicoes['carregar_mes_sqlite'] = medir(
+            lambda: armazenamento.carregar(inicio.isoformat(), fim.isoformat()), repeticoes
+        )
+        armazenamento.fechar()
+    return medicoes
+
+
+def _versao_codigo():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def comparar(anterior, atual):
+    """Imprime a razão entre as medianas atuais e as de um resultado anterior."""
+    base = {(r['tamanho'], r['operacao']): r['mediana_ms'] for r in anterior['resultados']}
+    for resultado in atual['resultados']:
+        chave = (resultado['tamanho'], resultado['operacao'])
+        if chave in base and base[chave]:
+            razao = resultado['mediana_ms'] / base[chave]
+            print(f"{resultado['tamanho']:>9} {resultado['operacao']:<28} "
+                  f"{base[chave]:>10.2f} -> {resultado['mediana_ms']:>10.2f} ms  ({razao:.2f}x)",
+                  file=sys.stderr)
+
+
+def main(argumentos=None):
+    parser = argparse.ArgumentParser(description="Benchmark do Alfredo com carga sintética.")
+    parser.add_argument('--tamanhos', type=int, nargs='+', default=TAMANHOS_PADRAO,
+                        help="Quantidades de eventos (ex.: 1000 10000 1000000)")
+    parser.add_argument('--repeticoes', type=int, default=REPETICOES_PADRAO)
+    parser.add_argument('--semente', type=int, default=0)
+    parser.add_argument('--saida', help="Arquivo JSON de saída (padrão: stdout)")
+    parser.add_argument('--comparar', help="Resultado anterior (JSON) para comparação")
+    args = parser.parse_args(argumentos)
+
+    resultado = {
+        'codigo': _versao_codigo(),
+        'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'plataforma': platform.platform(),
+        'repeticoes': args.repeticoes,
+        'resultados': [],
+    }
+    for tamanho in args.tamanhos:
+        print(f"Medindo {tamanho} eventos...", file=sys.stderr)
+        for operacao, tempos in executar(tamanho, args.repeticoes, args.semente).items():
+            resultado['resultados'].append({
+                'tamanho': tamanho,
+                'operacao': operacao,
+                'min_ms': round(min(tempos), 3),
+                'mediana_ms': round(statistics.median(tempos), 3),
+                'max_ms': round(max(tempos), 3),
+            })
+
+    texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+    if args.saida:
+        with open(args.saida, 'w', encoding='utf-8') as f:
+            f.write(texto + '\n')
+    else:
+        print(texto)
+
+    if args.comparar:
+        with open(args.comparar, encoding='utf-8') as f:
+            comparar(json.load(f), resultado)
+    return resultado
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+from datetime import datetime
+from repositorio_eventos import EventStore, meses_do_intervalo
+from recorrencia import ocorrencias
+
+# Tempo (segundos) até o cache conferir o token de versão no banco
+TTL_CACHE_EVENTOS = int(os.environ.get('ALFREDO_CACHE_TTL', 60))
+
+
+# Início do mês seguinte a (ano, mês)
+def inicio_mes_seguinte(ano, mes):
+    return datetime(ano + 1, 1, 1) if mes == 12 else datetime(ano, mes + 1, 1)
+
+
+class CacheEventos:
+    """
+    EventStore compartilhado por todas as sessões do processo.
+
+    Os eventos são carregados por mês, apenas para as janelas que alguma sessão
+    está vendo, e servidos a todas as sessões. Depois do TTL, apenas o token de
+    versão é lido do banco; os meses carregados só são descartados quando o
+    token mudou (escrita feita por outro processo) ou não pôde ser lido.
+    Escritas feitas neste processo atualizam o store diretamente e registram o
+    novo token, sem recarregar.
+
+    As regras de reuniões recorrentes (poucas) são lidas inteiras; suas
+    ocorrências são geradas e colocadas no store apenas para os meses carregados.
+    """
+
+    def __init__(self, ttl=TTL_CACHE_EVENTOS):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._store = EventStore()
+        self._meses = set()
+        self._regras = None
+        self._ocorrencias = {}
+        self._token = None
+        self._verificado_em = None
+
+    def _valido(self):
+        return self._verificado_em is not None and time.monotonic() - self._verificado_em < self.ttl
+
+    def obter_store(self, meses, carregar, ler_token, carregar_regras=None):
+        """
+        Retorna o store compartilhado com os meses (ano, mês) pedidos carregados.
+
+        'carregar(inicio, fim)' devolve os eventos que começam em [inicio, fim);
+        'ler_token' devolve o token de versão atual (ou None se o banco não
+        estiver acessível); 'carregar_regras()' devolve as regras de recorrência.
+        """
+        meses = set(meses)
+        if self._valido() and meses <= self._meses:
+            return self._store
+        with self._lock:
+            if not self._valido():
+                token = ler_token()
+                if token is None or token != self._token:
+                    self._store = EventStore()
+                    self._meses = set()
+                    self._regras = None
+                    self._ocorrencias = {}
+                    self._token = token
+                self._verificado_em = time.monotonic()
+            if self._regras is None:
+                self._regras = {regra['id']: regra for regra in carregar_regras()} if carregar_regras else {}
+
+            faltando = sorted(meses - self._meses)
+            if faltando:
+                # Uma única consulta cobre do primeiro ao último mês faltante
+                inicio = datetime(*faltando[0], 1)
+                fim = inicio_mes_seguinte(*faltando[-1])
+                for evento in carregar(inicio, fim):
+                    self._store.adicionar(evento)
+                for regra in self._regras.values():
+                    self._expandir(regra, inicio, fim)
+                self._meses |= set(meses_do_intervalo(inicio, fim))
+            return self._store
+
+    def _expandir(self, regra, inicio, fim):
+        for ocorrencia in ocorrencias(regra, inicio, fim):
+            self._store.adicionar(ocorrencia)
+            self._ocorrencias.setdefault(regra['id'], set()).add(ocorrencia['id'])
+
+    def registrar_escrita(self, token):
+        """
+        Registra o token gerado por uma escrita deste processo.
+
+        Se o token avançou mais de uma unidade, outro processo também escreveu
+        e os meses carregados são descartados no próximo acesso.
+        """
+        with self._lock:
+            if token is None:
+                return
+            if self._token is None or token != self._token + 1:
+                self._verificado_em = None
+                self._token = None
+            else:
+                self._token = token
+
+    def substituir_evento(self, evento_id, evento):
+        """Troca um único evento pela versão do banco (None se ele foi removido)."""
+        with self._lock:
+            if evento is None:
+                self._store.remover(evento_id)
+            else:
+                self._store.adicionar(evento)
+
+    def obter_regra(self, regra_id):
+        return (self._regras or {}).get(regra_id)
+
+    def substituir_regra(self, regra_id, regra):
+        """Troca uma regra (None se ela foi removida) e refaz suas ocorrências nos meses carregados."""
+        with self._lock:
+            for ocorrencia_id in self._ocorrencias.pop(regra_id, set()):
+                self._store.remover(ocorrencia_id)
+            if self._regras is None:
+                return
+            if regra is None:
+                self._regras.pop(regra_id, None)
+                return
+            self._regras[regra_id] = regra
+            for ano, mes in self._meses:
+                self._expandir(regra, datetime(ano, mes, 1), inicio_mes_seguinte(ano, mes))
+
+    def descartar(self):
+        """Descarta os meses carregados; o próximo acesso lê tudo de novo do banco."""
+        with self._lock:
+            self._verificado_em = None
+            self._token = None
+
+    def invalidar(self):
+        """Força a conferência do token (e possível recarga) no próximo acesso."""
+        with self._lock:
+            self._verificado_em = None
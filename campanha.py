@@ -0,0 +1,66 @@
+from datetime import date, timedelta
+from cache_eventos import inicio_mes_seguinte
+from repositorio_eventos import chaves_conflito
+from horarios_livres import ocupacao_por_chave, horarios_livres, marcar_ocupacao
+
+# Modelo de título das reuniões da campanha; aceita {departamento}, {ano} e {mes}
+MODELO_TITULO_PADRAO = "[ORÇAMENTO {ano}] {departamento}"
+
+# Duração (horas) das reuniões das unidades (departamentos 'CSA - ...') e das áreas
+DURACAO_UNIDADES = 1.0
+DURACAO_AREAS = 0.5
+PREFIXO_UNIDADES = 'CSA - '
+
+
+def duracao_do_departamento(departamento, duracao_unidades=DURACAO_UNIDADES, duracao_areas=DURACAO_AREAS):
+    return duracao_unidades if departamento.startswith(PREFIXO_UNIDADES) else duracao_areas
+
+
+def planejar_campanha(eventos_do_mes, pendentes, colaboradores_do_departamento, ano, mes,
+                      modelo_titulo=MODELO_TITULO_PADRAO, descricao='',
+                      duracao_unidades=DURACAO_UNIDADES, duracao_areas=DURACAO_AREAS,
+                      participantes_fixos=(), agora=None):
+    """
+    Distribui uma reunião por departamento pendente no mês, sem conflitos.
+
+    'eventos_do_mes' são os eventos já existentes no mês; a ocupação de todos
+    os participantes e departamentos envolvidos é montada uma única vez e cada
+    reunião planejada é marcada nela, de modo que reuniões da própria campanha
+    também não se sobrepõem. 'colaboradores_do_departamento' devolve as pessoas
+    de um departamento (ex.: DadosReferencia.colaboradores_do_departamento).
+    'participantes_fixos' (ex.: quem conduz a campanha)
+    entram em todas as reuniões. Retorna (eventos_planejados, departamentos_sem_horario).
+    """
+    fixos = list(participantes_fixos)
+    participantes = {departamento: list(dict.fromkeys(list(colaboradores_do_departamento(departamento)) + fixos))
+                     for departamento in pendentes}
+    chaves = set()
+    for departamento in pendentes:
+        chaves.update(chaves_conflito(participantes[departamento], departamento))
+    ocupacao = ocupacao_por_chave(eventos_do_mes, chaves)
+
+    primeiro_dia = date(ano, mes, 1)
+    ultimo_dia = (inicio_mes_seguinte(ano, mes) - timedelta(days=1)).date()
+    planejados = []
+    sem_horario = []
+    for departamento in pendentes:
+        nomes = participantes[departamento]
+        chaves_departamento = chaves_conflito(nomes, departamento)
+        duracao = duracao_do_departamento(departamento, duracao_unidades, duracao_areas)
+        horarios = horarios_livres({chave: ocupacao[chave] for chave in chaves_departamento},
+                                   primeiro_dia, ultimo_dia, duracao, quantidade=1, agora=agora)
+        if not horarios:
+            sem_horario.append(departamento)
+            continue
+        inicio, fim = horarios[0]
+        for chave in chaves_departamento:
+            marcar_ocupacao(ocupacao[chave], inicio, fim)
+        planejados.append({
+            'title': modelo_titulo.format(departamento=departamento, ano=ano, mes=mes),
+            'start': inicio.isoformat(timespec='seconds'),
+            'end': fim.isoformat(timespec='seconds'),
+            'departamento': departamento,
+            'participantes': nomes,
+            'description': descricao,
+        })
+    return planejados, sem_horario
@@ -0,0 +1,105 @@
+import argparse
+from collections import Counter
+import pandas as pd
+from repositorio_eventos import chave_mes
+
+MESES = range(1, 13)
+
+
+def matriz_da_tabela(tabela, departamentos):
+    """
+    Matriz departamento × (ano, mês) com o número de reuniões.
+
+    Contada sobre os arrays de uma TabelaEventos; todas as métricas da página
+    de Controle são lidas dela. Departamentos sem reuniões aparecem com zeros.
+    """
+    return _matriz(tabela.contagem_por_mes(), departamentos)
+
+
+def matriz_do_resumo(linhas, departamentos, eventos_extras=()):
+    """
+    Mesma matriz de matriz_da_tabela, a partir do resumo 'cobertura_mensal'.
+
+    'linhas' são (departamento, ano, mes, quantidade) lidas do armazenamento;
+    'eventos_extras' (ex.: ocorrências de reuniões recorrentes, que não entram
+    no resumo) são somados. O custo depende de departamentos × meses, não do
+    número de eventos.
+    """
+    contagem = _contar(eventos_extras)
+    for departamento, ano, mes, quantidade in linhas:
+        contagem[(departamento, ano, mes)] += quantidade
+    return _matriz(contagem, departamentos)
+
+
+def _contar(eventos):
+    contagem = Counter()
+    for evento in eventos:
+        departamento = evento.get('departamento')
+        mes = chave_mes(evento)
+        if departamento and mes is not None:
+            contagem[(departamento, *mes)] += 1
+    return contagem
+
+
+def _matriz(contagem, departamentos):
+    if contagem:
+        serie = pd.Series(contagem)
+        serie.index.names = ['departamento', 'ano', 'mes']
+        matriz = serie.unstack(['ano', 'mes'], fill_value=0)
+    else:
+        matriz = pd.DataFrame(columns=pd.MultiIndex.from_tuples([], names=['ano', 'mes']))
+    return matriz.reindex(index=list(departamentos), fill_value=0).astype(int)
+
+
+def cobertura_anual(matriz, ano):
+    """DataFrame booleano departamento × mês (1-12) para o ano informado."""
+    colunas = [(ano, mes) for mes in MESES]
+    anual = matriz.reindex(columns=pd.MultiIndex.from_tuples(colunas, names=['ano', 'mes']), fill_value=0)
+    anual.columns = list(MESES)
+    return anual > 0
+
+
+def cobertura_do_mes(matriz, mes, ano=None):
+    """Série booleana por departamento: há reunião no mês (em qualquer ano se 'ano' for None)."""
+    if ano is not None:
+        return cobertura_anual(matriz, ano)[mes]
+    colunas = [coluna for coluna in matriz.columns if coluna[1] == mes]
+    if not colunas:
+        return pd.Series(False, index=matriz.index)
+    return (matriz[colunas] > 0).any(axis=1)
+
+
+def percentual_mensal(matriz, ano):
+    """Percentual de departamentos com reunião em cada mês do ano."""
+    anual = cobertura_anual(matriz, ano)
+    if anual.empty:
+        return pd.Series(0.0, index=list(MESES))
+    return anual.mean(axis=0) * 100
+
+
+def percentual_historico(matriz, ano_inicio, ano_fim):
+    """Percentual de departamentos com reunião em cada mês de [ano_inicio, ano_fim], em uma Série (ano, mês)."""
+    return pd.concat({ano: percentual_mensal(matriz, ano) for ano in range(ano_inicio, ano_fim + 1)},
+                     names=['ano', 'mes'])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manutenção do resumo de cobertura mensal.")
+    parser.add_argument('--reconstruir', action='store_true',
+                        help="Recalcula 'cobertura_mensal' a partir dos eventos (reparo)")
+    argumentos = parser.parse_args()
+    if not argumentos.reconstruir:
+        parser.print_help()
+        return
+    from armazenamento import TIPO_ARMAZENAMENTO, CAMINHO_SQLITE, ArmazenamentoMongo, ArmazenamentoSQLite
+    if TIPO_ARMAZENAMENTO == 'sqlite':
+        armazenamento = ArmazenamentoSQLite(CAMINHO_SQLITE)
+    else:
+        from conexao import obter_banco, ESPERA_CONEXAO_LINHA_DE_COMANDO
+        armazenamento = ArmazenamentoMongo(obter_banco(espera=ESPERA_CONEXAO_LINHA_DE_COMANDO))
+    quantidade = armazenamento.reconstruir_cobertura()
+    print(f"Resumo de cobertura reconstruído ({armazenamento.nome}): {quantidade} departamento(s)/mês")
+
+
+if __name__ == '__main__':
+    main()
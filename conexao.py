@@ -0,0 +1,332 @@
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import streamlit as st
+from pymongo import MongoClient
+from pymongo.errors import ConnectionFailure
+
+# Nome do banco de dados usado pela aplicação
+NOME_BANCO = 'alfredo_db'
+
+# Configuração padrão do pool de conexões (pode ser sobrescrita em
+# st.secrets["mongodb"] ou por variáveis de ambiente ALFREDO_MONGO_*)
+CONFIG_POOL_PADRAO = {
+    'max_pool_size': 50,
+    'min_pool_size': 0,
+    'max_idle_time_ms': 60000,
+    'server_selection_timeout_ms': 5000,
+    'connect_timeout_ms': 5000,
+    'socket_timeout_ms': 10000,
+}
+
+# Tempo máximo (s) que uma página espera pela primeira conexão; depois disso
+# usa o fallback local. Uma primeira conexão lenta (handshake SRV + TLS do
+# Atlas) continua em segundo plano e, quando termina, as funções registradas
+# em registrar_reconexao atualizam o cache.
+ESPERA_CONEXAO_INICIAL = float(os.environ.get('ALFREDO_MONGO_ESPERA_INICIAL', 0.5))
+
+# Em scripts de linha de comando não há fallback: espera a conexão por mais tempo
+ESPERA_CONEXAO_LINHA_DE_COMANDO = 30
+
+# Intervalos (s) entre as tentativas de reconexão em segundo plano (dobram a cada falha)
+ESPERA_RECONEXAO_INICIAL = float(os.environ.get('ALFREDO_MONGO_RECONEXAO_INICIAL', 1))
+ESPERA_RECONEXAO_MAXIMA = float(os.environ.get('ALFREDO_MONGO_RECONEXAO_MAXIMA', 60))
+
+# Mapeamento das chaves de configuração para os parâmetros do MongoClient
+_PARAMETROS_CLIENTE = {
+    'max_pool_size': 'maxPoolSize',
+    'min_pool_size': 'minPoolSize',
+    'max_idle_time_ms': 'maxIdleTimeMS',
+    'server_selection_timeout_ms': 'serverSelectionTimeoutMS',
+    'connect_timeout_ms': 'connectTimeoutMS',
+    'socket_timeout_ms': 'socketTimeoutMS',
+}
+
+
+def _secrets_mongodb():
+    # st.secrets levanta exceção quando não há arquivo de segredos
+    try:
+        return dict(st.secrets["mongodb"])
+    except Exception:
+        return {}
+
+
+def ler_configuracao_pool(segredos=None):
+    """Retorna a configuração do pool, combinando padrão, segredos e ambiente."""
+    config = dict(CONFIG_POOL_PADRAO)
+    segredos = _secrets_mongodb() if segredos is None else segredos
+    for chave in config:
+        valor = os.environ.get(f"ALFREDO_MONGO_{chave.upper()}", segredos.get(chave))
+        if valor is not None:
+            config[chave] = int(valor)
+    return config
+
+
+class ConexaoIndisponivel(RuntimeError):
+    """O MongoDB não está acessível (circuito aberto ou primeira conexão em andamento)."""
+
+
+def _resolver_credenciais(segredos):
+    """
+    Lista de (connection_string, origem) de todas as fontes de credenciais disponíveis.
+
+    Resolvida uma única vez por processo: segredos do Streamlit e módulo local
+    'mongodb'. Fontes ausentes ou incompletas (ex.: seção [mongodb] só com a
+    configuração do pool) são ignoradas.
+    """
+    credenciais = []
+    if all(segredos.get(chave) for chave in ('username', 'password', 'cluster_url')):
+        user = segredos["username"]
+        password = segredos["password"]
+        cluster_url = segredos["cluster_url"]
+        connection_string = f"mongodb+srv://{user}:{password}@{cluster_url}/?retryWrites=true&w=majority"
+        credenciais.append((connection_string, "segredos do Streamlit"))
+
+    # Credenciais locais
+    try:
+        from mongodb import secure_password, string
+        credenciais.append((string.replace('<db_password>', secure_password), "credenciais locais"))
+    except ImportError:
+        pass
+    return credenciais
+
+
+def _parametros_cliente(segredos):
+    return {_PARAMETROS_CLIENTE[chave]: valor for chave, valor in ler_configuracao_pool(segredos).items()}
+
+
+def _conectar_com(connection_string, origem, parametros):
+    client = MongoClient(connection_string, **parametros)
+    try:
+        client.admin.command('ping')
+    except Exception:
+        client.close()
+        raise
+    return client, origem
+
+
+def _fechar_perdedor(futuro):
+    if futuro.exception() is None:
+        futuro.result()[0].close()
+
+
+def _conectar(credenciais, parametros):
+    """
+    Conecta com todas as fontes de credenciais ao mesmo tempo e fica com a
+    primeira que responder ao ping; os clientes das demais são fechados.
+    """
+    if not credenciais:
+        raise ConexaoIndisponivel("Nenhuma credencial do MongoDB encontrada (segredos do Streamlit ou módulo 'mongodb').")
+    if len(credenciais) == 1:
+        return _conectar_com(*credenciais[0], parametros)
+    executor = ThreadPoolExecutor(max_workers=len(credenciais), thread_name_prefix='alfredo-conexao')
+    futuros = [executor.submit(_conectar_com, *credencial, parametros) for credencial in credenciais]
+    erros = []
+    try:
+        for futuro in as_completed(futuros):
+            try:
+                vencedor = futuro.result()
+            except Exception as e:
+                erros.append(e)
+                continue
+            for outro in futuros:
+                if outro is not futuro:
+                    outro.add_done_callback(_fechar_perdedor)
+            return vencedor
+    finally:
+        # Não espera as tentativas perdedoras, que terminam em segundo plano
+        executor.shutdown(wait=False)
+    raise ConexaoIndisponivel("; ".join(str(erro) for erro in erros))
+
+
+class DisjuntorConexao:
+    """
+    Circuit breaker da conexão com o MongoDB, compartilhado pelo processo.
+
+    A primeira conexão é feita em segundo plano; quem pede o cliente espera no
+    máximo 'espera_inicial' segundos (contados do início da tentativa), e a
+    tentativa continua depois disso.
+    Se a conexão falhar, ou uma operação falhar por erro de rede (ver
+    registrar_falha), o circuito abre: os pedidos recebem ConexaoIndisponivel
+    imediatamente, sem esperar timeouts, e uma thread tenta reconectar com
+    espera crescente (ESPERA_RECONEXAO_INICIAL até ESPERA_RECONEXAO_MAXIMA).
+    Quando a conexão (ou reconexão) dá certo o circuito fecha e as funções
+    registradas em ao_reconectar são chamadas, pois até ali as páginas podem
+    ter usado o fallback local.
+    """
+
+    def __init__(self, conectar, espera_inicial=ESPERA_CONEXAO_INICIAL,
+                 reconexao_inicial=ESPERA_RECONEXAO_INICIAL, reconexao_maxima=ESPERA_RECONEXAO_MAXIMA):
+        self._conectar = conectar
+        self._espera_inicial = espera_inicial
+        self._reconexao_inicial = reconexao_inicial
+        self._reconexao_maxima = reconexao_maxima
+        self._lock = threading.Lock()
+        self._pronto = threading.Event()
+        self._cliente = None
+        self._erro = None
+        self._aberto = False
+        self._tentando = False
+        self._inicio_tentativa = None
+        self._proxima_tentativa = None
+        self.ao_reconectar = []
+
+    def _iniciar_tentativas(self):
+        # Chamado com o lock; uma única thread tenta (re)conectar por vez
+        if self._tentando:
+            return
+        self._tentando = True
+        self._pronto.clear()
+        self._inicio_tentativa = time.monotonic()
+        threading.Thread(target=self._tentar, name='alfredo-reconexao', daemon=True).start()
+
+    def _tentar(self):
+        espera = self._reconexao_inicial
+        while True:
+            try:
+                if self._cliente is not None:
+                    # Circuito aberto por falha em operação: o cliente existente é reaproveitado
+                    self._cliente[0].admin.command('ping')
+                    cliente = self._cliente
+                else:
+                    cliente = self._conectar()
+            except Exception as e:
+                with self._lock:
+                    self._erro = e
+                    self._aberto = True
+                    self._proxima_tentativa = time.monotonic() + espera
+                self._pronto.set()
+                time.sleep(espera)
+                espera = min(espera * 2, self._reconexao_maxima)
+                continue
+            with self._lock:
+                self._cliente, self._erro, self._aberto = cliente, None, False
+                self._tentando = False
+                self._proxima_tentativa = None
+                ouvintes = list(self.ao_reconectar)
+            self._pronto.set()
+            for ouvinte in ouvintes:
+                try:
+                    ouvinte()
+                except Exception:
+                    pass
+            return
+
+    def _indisponivel(self):
+        if self._erro is None:
+            return ConexaoIndisponivel("Conectando ao MongoDB...")
+        restante = max(0.0, (self._proxima_tentativa or time.monotonic()) - time.monotonic())
+        return ConexaoIndisponivel(f"{self._erro} (nova tentativa em {restante:.0f} s)")
+
+    def obter(self, espera=None):
+        """Retorna (client, origem) ou levanta ConexaoIndisponivel sem esperar timeouts de rede."""
+        with self._lock:
+            if self._cliente is not None and not self._aberto:
+                return self._cliente
+            if self._aberto:
+                raise self._indisponivel()
+            self._iniciar_tentativas()
+            limite = self._inicio_tentativa + (self._espera_inicial if espera is None else espera)
+        self._pronto.wait(max(0.0, limite - time.monotonic()))
+        with self._lock:
+            if self._cliente is not None and not self._aberto:
+                return self._cliente
+            raise self._indisponivel()
+
+    def registrar_falha(self, erro):
+        """Abre o circuito após um erro de rede em uma operação com o cliente."""
+        with self._lock:
+            self._erro = erro
+            self._aberto = True
+            self._proxima_tentativa = time.monotonic() + self._reconexao_inicial
+            self._iniciar_tentativas()
+
+    def estado(self):
+        with self._lock:
+            if self._aberto:
+                return 'aberto'
+            return 'fechado' if self._cliente is not None else 'conectando'
+
+
+# Disjuntor do processo. Não usa st.cache_resource: as mensagens que st.secrets
+# emite quando não há arquivo de segredos seriam repetidas a cada chamada.
+_disjuntor = None
+_lock_disjuntor = threading.Lock()
+
+
+def obter_disjuntor():
+    """Disjuntor do processo; credenciais e configuração são resolvidas uma única vez, aqui."""
+    global _disjuntor
+    with _lock_disjuntor:
+        if _disjuntor is None:
+            segredos = _secrets_mongodb()
+            credenciais = _resolver_credenciais(segredos)
+            parametros = _parametros_cliente(segredos)
+            _disjuntor = DisjuntorConexao(lambda: _conectar(credenciais, parametros))
+        return _disjuntor
+
+
+def obter_cliente(espera=None):
+    """
+    Retorna (client, origem) do único MongoClient do processo.
+
+    O cliente mantém um pool de conexões e é compartilhado por todas as sessões
+    e reruns do Streamlit. Sem conexão, levanta ConexaoIndisponivel logo (ver
+    DisjuntorConexao); 'espera' aumenta o tempo de espera da primeira conexão
+    (ex.: em scripts de linha de comando).
+    """
+    return obter_disjuntor().obter(espera)
+
+
+def obter_banco(espera=None):
+    """Retorna o banco 'alfredo_db' usando o cliente compartilhado."""
+    client, _ = obter_cliente(espera)
+    return client[NOME_BANCO]
+
+
+def estado_conexao():
+    """'fechado' (conectado), 'aberto' (sem conexão) ou 'conectando' (primeira tentativa)."""
+    return obter_disjuntor().estado()
+
+
+def registrar_falha(erro):
+    """Informa ao disjuntor um erro de rede ocorrido em uma operação."""
+    obter_disjuntor().registrar_falha(erro)
+
+
+def registrar_reconexao(funcao):
+    """Registra uma função chamada (em segundo plano) sempre que a conexão é estabelecida."""
+    obter_disjuntor().ao_reconectar.append(funcao)
+
+
+def verificar_conexao():
+    """
+    Verifica a saúde da conexão usando o cliente compartilhado.
+
+    Retorna um dicionário com 'ok', 'origem', 'latencia_ms', 'pool', 'circuito'
+    e 'erro'. Não abre um novo cliente: o ping reaproveita uma conexão do pool.
+    Um ping que falha por erro de rede abre o circuito.
+    """
+    status = {'ok': False, 'origem': None, 'latencia_ms': None,
+              'pool': ler_configuracao_pool(), 'circuito': None, 'erro': None}
+    disjuntor = None
+    try:
+        disjuntor = obter_disjuntor()
+        status['circuito'] = disjuntor.estado()
+        client, origem = disjuntor.obter()
+        status['origem'] = origem
+        inicio = time.perf_counter()
+        try:
+            client.admin.command('ping')
+        except ConnectionFailure as e:
+            registrar_falha(e)
+            raise
+        status['latencia_ms'] = (time.perf_counter() - inicio) * 1000
+        status['ok'] = True
+    except Exception as e:
+        status['erro'] = str(e)
+    if disjuntor is not None:
+        status['circuito'] = disjuntor.estado()
+    return status
+
@@ -0,0 +1,156 @@
+import json
+import os
+import threading
+from persistencia import INSERIR, ATUALIZAR, EXCLUIR
+
+# Diário local (JSON Lines) das alterações feitas sem conexão com o banco de dados.
+# Cada linha é {'tipo', 'evento', 'base'}, onde 'base' é a versão que o
+# documento deve ter no banco para a alteração ser aplicada.
+CAMINHO_DIARIO = os.environ.get(
+    'ALFREDO_DIARIO',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backups', 'diario.jsonl')
+)
+
+# Tamanho (bytes) a partir do qual o diário é compactado após uma gravação
+LIMITE_COMPACTACAO = 256 * 1024
+# O diário só é compactado de novo quando crescer este fator sobre o tamanho
+# que ficou na última compactação, para que o custo continue amortizado mesmo
+# quando os registros distintos já passam de LIMITE_COMPACTACAO
+FATOR_COMPACTACAO = 2
+
+_lock = threading.Lock()
+# Caminho -> tamanho do diário após a última compactação neste processo
+_tamanho_compactado = {}
+
+
+def _base(tipo, evento):
+    if tipo == ATUALIZAR:
+        return evento['versao'] - 1
+    if tipo == EXCLUIR:
+        return evento['versao']
+    return None
+
+
+def _ler(caminho):
+    registros = []
+    try:
+        with open(caminho, 'r', encoding='utf-8') as f:
+            for linha in f:
+                linha = linha.strip()
+                if not linha:
+                    continue
+                try:
+                    registros.append(json.loads(linha))
+                except ValueError:
+                    # Linha incompleta (queda durante a gravação): ignorada
+                    continue
+    except FileNotFoundError:
+        pass
+    return registros
+
+
+def _escrever(caminho, registros, modo):
+    os.makedirs(os.path.dirname(caminho), exist_ok=True)
+    with open(caminho, modo, encoding='utf-8') as f:
+        for registro in registros:
+            f.write(json.dumps(registro, ensure_ascii=False) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def compactar_registros(registros):
+    """
+    Reduz o diário a um registro por evento, mantendo o estado final.
+
+    inserir + atualizar vira um inserir com o evento mais recente; inserir +
+    excluir desaparece; atualizações seguidas mantêm a base da primeira.
+    """
+    por_id = {}
+    for registro in registros:
+        evento_id = registro['evento']['id']
+        anterior = por_id.get(evento_id)
+        if anterior is None:
+            por_id[evento_id] = dict(registro)
+        elif anterior['tipo'] == INSERIR and registro['tipo'] == EXCLUIR:
+            del por_id[evento_id]
+        elif anterior['tipo'] == INSERIR:
+            por_id[evento_id] = {**anterior, 'evento': registro['evento']}
+        else:
+            por_id[evento_id] = {**registro, 'base': anterior['base']}
+    return list(por_id.values())
+
+
+def registrar(operacoes, caminho=CAMINHO_DIARIO):
+    """Acrescenta as operações ao diário (uma linha cada, com fsync)."""
+    registros = [{'tipo': tipo, 'evento': evento, 'base': _base(tipo, evento)} for tipo, evento in operacoes]
+    with _lock:
+        _escrever(caminho, registros, 'a')
+        limite = max(LIMITE_COMPACTACAO, FATOR_COMPACTACAO * _tamanho_compactado.get(caminho, 0))
+        if os.path.getsize(caminho) > limite:
+            compactados = compactar_registros(_ler(caminho))
+            temporario = caminho + '.tmp'
+            _escrever(temporario, compactados, 'w')
+            os.replace(temporario, caminho)
+            _tamanho_compactado[caminho] = os.path.getsize(caminho)
+
+
+def tem_pendencias(caminho=CAMINHO_DIARIO):
+    try:
+        return os.path.getsize(caminho) > 0
+    except OSError:
+        return False
+
+
+def pendentes(caminho=CAMINHO_DIARIO):
+    """Registros pendentes, já compactados."""
+    with _lock:
+        return compactar_registros(_ler(caminho))
+
+
+def aplicar_em_eventos(eventos, inicio_iso, fim_iso, caminho=CAMINHO_DIARIO):
+    """Aplica as alterações pendentes sobre os eventos carregados da janela [inicio, fim)."""
+    registros = pendentes(caminho)
+    if not registros:
+        return eventos
+    por_id = {evento['id']: evento for evento in eventos}
+    for registro in registros:
+        evento = registro['evento']
+        if evento.get('recorrencia'):
+            continue
+        if registro['tipo'] == EXCLUIR or not (inicio_iso <= evento['start'] < fim_iso):
+            por_id.pop(evento['id'], None)
+        else:
+            por_id[evento['id']] = evento
+    return list(por_id.values())
+
+
+def aplicar_em_regras(regras, caminho=CAMINHO_DIARIO):
+    """Aplica as alterações pendentes sobre as regras de recorrência carregadas."""
+    registros = [registro for registro in pendentes(caminho) if registro['evento'].get('recorrencia')]
+    if not registros:
+        return regras
+    por_id = {regra['id']: regra for regra in regras}
+    for registro in registros:
+        if registro['tipo'] == EXCLUIR:
+            por_id.pop(registro['evento']['id'], None)
+        else:
+            por_id[registro['evento']['id']] = registro['evento']
+    return list(por_id.values())
+
+
+def reproduzir(armazenamento, caminho=CAMINHO_DIARIO):
+    """
+    Aplica o diário no armazenamento (ver armazenamento.py) e o esvazia.
+
+    A reprodução é idempotente: inserções ignoram eventos já existentes,
+    atualizações e exclusões só se aplicam na versão 'base'; repetir não
+    altera nada. Retorna (aplicados, ids_em_conflito).
+    """
+    with _lock:
+        registros = compactar_registros(_ler(caminho))
+        if not registros:
+            return 0, []
+        conflitos = armazenamento.reproduzir(registros)
+        os.remove(caminho)
+        _tamanho_compactado.pop(caminho, None)
+        return len(registros) - len(conflitos), conflitos
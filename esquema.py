@@ -0,0 +1,114 @@
+from datetime import datetime
+from pymongo import UpdateOne
+
+# Formato de um evento:
+#   {'id', 'title', 'start', 'end', 'departamento', 'participantes', 'description', 'versao'}
+# 'start' e 'end' são ISO sem fuso ("YYYY-MM-DDTHH:MM:SS"), 'participantes' é
+# uma lista de nomes, 'description' contém apenas o texto livre e 'versao' é
+# incrementada a cada alteração (controle de concorrência otimista).
+
+PREFIXO_DEPARTAMENTO = 'Departamento: '
+PREFIXO_PARTICIPANTES = 'Participantes: '
+
+# Tamanho dos lotes de bulk_write na migração
+TAMANHO_LOTE_MIGRACAO = 1000
+
+
+# Converte uma data ISO (com ou sem 'Z') em datetime sem fuso, mantendo o horário escrito
+def converter_data(valor):
+    if isinstance(valor, datetime):
+        return valor.replace(tzinfo=None)
+    return datetime.fromisoformat(valor.replace('Z', '+00:00')).replace(tzinfo=None)
+
+
+# Normaliza uma data para o formato ISO único usado pela aplicação
+def normalizar_data(valor):
+    return converter_data(valor).isoformat(timespec='seconds')
+
+
+# Separa a descrição antiga ("Departamento: X\nParticipantes: a, b\n\ntexto")
+def separar_descricao(descricao):
+    departamento = None
+    participantes = []
+    texto = descricao or ''
+    linhas = texto.split('\n')
+    if linhas and linhas[0].startswith(PREFIXO_DEPARTAMENTO):
+        departamento = linhas[0][len(PREFIXO_DEPARTAMENTO):].strip()
+        resto = linhas[1:]
+        if resto and resto[0].startswith(PREFIXO_PARTICIPANTES):
+            participantes = separar_participantes(resto[0][len(PREFIXO_PARTICIPANTES):])
+            resto = resto[1:]
+        texto = '\n'.join(resto).lstrip('\n')
+    return departamento, participantes, texto
+
+
+# Converte "a, b" (ou uma lista) na lista de participantes
+def separar_participantes(valor):
+    if isinstance(valor, (list, tuple)):
+        return [str(nome).strip() for nome in valor if str(nome).strip()]
+    return [nome.strip() for nome in (valor or '').split(',') if nome.strip()]
+
+
+def normalizar_evento(evento):
+    """
+    Retorna o evento no formato estruturado.
+
+    Eventos antigos têm departamento e participantes extraídos da descrição;
+    as datas são normalizadas uma única vez, na entrada.
+    """
+    evento = dict(evento)
+    if 'departamento' not in evento:
+        departamento, participantes, texto = separar_descricao(evento.get('description'))
+        evento['departamento'] = departamento
+        evento['participantes'] = participantes
+        evento['description'] = texto
+    else:
+        evento['participantes'] = separar_participantes(evento.get('participantes'))
+    evento.setdefault('versao', 1)
+    for campo in ('start', 'end'):
+        if evento.get(campo):
+            try:
+                evento[campo] = normalizar_data(evento[campo])
+            except (TypeError, ValueError):
+                pass
+    return evento
+
+
+# Projeção enviada ao componente de calendário: só o necessário para desenhar
+# o evento. Descrição e participantes são lidos do store quando ele é clicado.
+def evento_para_calendario(evento, cor=None):
+    resumo = {'id': evento['id'], 'title': evento.get('title'), 'start': evento['start'], 'end': evento['end']}
+    if cor:
+        resumo['color'] = cor
+    return resumo
+
+
+# Texto exibido ao usuário, no mesmo formato da descrição antiga
+def descricao_completa(evento):
+    return (f"{PREFIXO_DEPARTAMENTO}{evento.get('departamento') or ''}\n"
+            f"{PREFIXO_PARTICIPANTES}{', '.join(evento.get('participantes') or [])}\n\n"
+            f"{evento.get('description') or ''}")
+
+
+def migrar_colecao(collection):
+    """
+    Migração única dos documentos antigos da coleção para o formato estruturado.
+
+    Só os documentos sem o campo 'departamento' são lidos e atualizados, em
+    lotes de bulk_write; documentos sem 'versao' recebem a versão 1. Executar
+    novamente não altera nada. Retorna o número de documentos migrados.
+    """
+    migrados = 0
+    lote = []
+    for documento in collection.find({'departamento': {'$exists': False}}):
+        evento = normalizar_evento(documento)
+        campos = {campo: evento.get(campo) for campo in
+                  ('start', 'end', 'departamento', 'participantes', 'description')}
+        lote.append(UpdateOne({'_id': documento['_id']}, {'$set': campos}))
+        if len(lote) >= TAMANHO_LOTE_MIGRACAO:
+            migrados += collection.bulk_write(lote, ordered=False).modified_count
+            lote = []
+    if lote:
+        migrados += collection.bulk_write(lote, ordered=False).modified_count
+    collection.update_many({'versao': {'$exists': False}}, {'$set': {'versao': 1}})
+    return migrados
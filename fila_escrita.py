@@ -0,0 +1,95 @@
+import queue
+import threading
+
+# Limite de itens pendentes; com a fila cheia a gravação volta a ser síncrona
+TAMANHO_MAXIMO_FILA = 1000
+# Máximo de itens (cliques) reunidos em um único bulk_write
+TAMANHO_MAXIMO_LOTE = 200
+# Tempo (segundos) esperando mais itens antes de gravar o lote
+ESPERA_LOTE = 0.05
+
+
+class FilaEscrita:
+    """
+    Fila de gravação em segundo plano (write-behind).
+
+    Cada item é (sessao, db, operacoes). Uma thread reúne os itens pendentes
+    do mesmo banco em um único lote e chama gravar(db, operacoes), que deve
+    devolver a lista de ids em conflito, ou None se as operações ficaram
+    pendentes (guardadas para sincronizar depois). O resultado de cada item fica
+    disponível para a sessão que o enviou em resultados(sessao).
+    A thread não usa chamadas do Streamlit.
+    """
+
+    def __init__(self, gravar, tamanho_maximo=TAMANHO_MAXIMO_FILA,
+                 tamanho_lote=TAMANHO_MAXIMO_LOTE, espera=ESPERA_LOTE):
+        self._gravar = gravar
+        self._tamanho_lote = tamanho_lote
+        self._espera = espera
+        self._fila = queue.Queue(maxsize=tamanho_maximo)
+        self._lock = threading.Lock()
+        self._resultados = {}
+        self._thread = threading.Thread(target=self._executar, name='alfredo-fila-escrita', daemon=True)
+        self._thread.start()
+
+    def enfileirar(self, sessao, db, operacoes):
+        """Enfileira sem bloquear. Retorna False se a fila estiver cheia."""
+        try:
+            self._fila.put_nowait((sessao, db, list(operacoes)))
+            return True
+        except queue.Full:
+            return False
+
+    def resultados(self, sessao):
+        """Retorna e descarta os resultados já gravados para a sessão."""
+        with self._lock:
+            return self._resultados.pop(sessao, [])
+
+    def aguardar(self):
+        """Bloqueia até que todos os itens enfileirados tenham sido gravados."""
+        self._fila.join()
+
+    def _registrar(self, sessao, resultado):
+        with self._lock:
+            self._resultados.setdefault(sessao, []).append(resultado)
+
+    def _proximo_lote(self):
+        itens = [self._fila.get()]
+        while len(itens) < self._tamanho_lote:
+            try:
+                itens.append(self._fila.get(timeout=self._espera))
+            except queue.Empty:
+                break
+        return itens
+
+    def _executar(self):
+        while True:
+            itens = self._proximo_lote()
+            try:
+                # Itens de bancos diferentes (ex.: após reconexão) são gravados separadamente
+                por_banco = {}
+                for item in itens:
+                    por_banco.setdefault(id(item[1]), []).append(item)
+                for grupo in por_banco.values():
+                    self._gravar_grupo(grupo)
+            finally:
+                for _ in itens:
+                    self._fila.task_done()
+
+    def _gravar_grupo(self, grupo):
+        db = grupo[0][1]
+        operacoes = [operacao for _, _, ops in grupo for operacao in ops]
+        try:
+            conflitos = self._gravar(db, operacoes)
+        except Exception as e:
+            for sessao, _, ops in grupo:
+                self._registrar(sessao, {'gravados': 0, 'conflitos': [], 'erro': str(e), 'pendentes': 0})
+            return
+        if conflitos is None:
+            for sessao, _, ops in grupo:
+                self._registrar(sessao, {'gravados': 0, 'conflitos': [], 'erro': None, 'pendentes': len(ops)})
+            return
+        conflitos = set(conflitos)
+        for sessao, _, ops in grupo:
+            ids = [evento['id'] for _, evento in ops if evento['id'] in conflitos]
+            self._registrar(sessao, {'gravados': len(ops) - len(ids), 'conflitos': ids, 'erro': None, 'pendentes': 0})
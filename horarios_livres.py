@@ -0,0 +1,93 @@
+import math
+from datetime import datetime, timedelta
+from esquema import converter_data
+from repositorio_eventos import chaves_conflito
+
+# Expediente usado no calendário (businessHours) e na validação do agendamento
+HORA_INICIO_EXPEDIENTE = 8
+HORA_FIM_EXPEDIENTE = 18
+MINUTOS_POR_SLOT = 30
+SLOTS_POR_DIA = (HORA_FIM_EXPEDIENTE - HORA_INICIO_EXPEDIENTE) * 60 // MINUTOS_POR_SLOT
+DIA_INTEIRO = (1 << SLOTS_POR_DIA) - 1
+
+# Dias da semana com expediente (segunda a sexta)
+DIAS_UTEIS = range(0, 5)
+
+
+def _slot(momento, dia, arredondar_para_cima=False):
+    minutos = (momento - datetime.combine(dia, datetime.min.time())).total_seconds() / 60
+    slot = (minutos - HORA_INICIO_EXPEDIENTE * 60) / MINUTOS_POR_SLOT
+    slot = math.ceil(slot) if arredondar_para_cima else math.floor(slot)
+    return min(max(slot, 0), SLOTS_POR_DIA)
+
+
+def marcar_ocupacao(bitmaps, inicio, fim):
+    """Marca em 'bitmaps' ({data: int}) os slots de [inicio, fim), dia a dia."""
+    dia = inicio.date()
+    while dia <= fim.date() and datetime.combine(dia, datetime.min.time()) < fim:
+        primeiro = _slot(inicio, dia)
+        ultimo = _slot(fim, dia, arredondar_para_cima=True)
+        if ultimo > primeiro:
+            bits = ((1 << (ultimo - primeiro)) - 1) << primeiro
+            bitmaps[dia] = bitmaps.get(dia, 0) | bits
+        dia += timedelta(days=1)
+
+
+def ocupacao_por_chave(eventos, chaves):
+    """
+    Bitmaps de ocupação ({chave: {data: int}}) das chaves de conflito pedidas.
+
+    Cada bit é um slot de MINUTOS_POR_SLOT minutos do expediente; o bit 0 é
+    o slot que começa às HORA_INICIO_EXPEDIENTE.
+    """
+    chaves = set(chaves)
+    ocupacao = {chave: {} for chave in chaves}
+    for evento in eventos:
+        inicio, fim = converter_data(evento['start']), converter_data(evento['end'])
+        envolvidas = chaves_conflito(evento.get('participantes') or [], evento.get('departamento'))
+        for chave in chaves.intersection(envolvidas):
+            marcar_ocupacao(ocupacao[chave], inicio, fim)
+    return ocupacao
+
+
+def _inicios_com_folga(livre, tamanho):
+    # Bit j fica ligado se os slots j .. j + tamanho - 1 estão todos livres
+    janela = livre
+    for deslocamento in range(1, tamanho):
+        janela &= livre >> deslocamento
+    return janela
+
+
+def horarios_livres(ocupacao, data_inicio, data_fim, duracao_horas, quantidade=5, agora=None):
+    """
+    Primeiros 'quantidade' horários em que todas as chaves estão livres.
+
+    Combina os bitmaps de 'ocupacao' (ver ocupacao_por_chave) com OR e procura,
+    dia útil a dia útil entre data_inicio e data_fim, sequências de slots livres
+    do tamanho da duração. Horários anteriores a 'agora' são ignorados.
+    Retorna uma lista de (inicio, fim) em datetime.
+    """
+    tamanho = math.ceil(duracao_horas * 60 / MINUTOS_POR_SLOT)
+    if tamanho <= 0 or tamanho > SLOTS_POR_DIA:
+        return []
+    sugestoes = []
+    dia = data_inicio
+    while dia <= data_fim and len(sugestoes) < quantidade:
+        if dia.weekday() in DIAS_UTEIS:
+            ocupado = 0
+            for bitmaps in ocupacao.values():
+                ocupado |= bitmaps.get(dia, 0)
+            livre = DIA_INTEIRO & ~ocupado
+            if agora is not None and dia == agora.date():
+                livre &= DIA_INTEIRO & ~((1 << _slot(agora, dia, arredondar_para_cima=True)) - 1)
+            elif agora is not None and dia < agora.date():
+                livre = 0
+            inicios = _inicios_com_folga(livre, tamanho)
+            while inicios and len(sugestoes) < quantidade:
+                slot = (inicios & -inicios).bit_length() - 1
+                inicios &= inicios - 1
+                inicio = datetime.combine(dia, datetime.min.time()) + timedelta(
+                    minutes=HORA_INICIO_EXPEDIENTE * 60 + slot * MINUTOS_POR_SLOT)
+                sugestoes.append((inicio, inicio + timedelta(hours=duracao_horas)))
+        dia += timedelta(days=1)
+    return sugestoes
@@ -0,0 +1,208 @@
+import csv
+import io
+import os
+import re
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from esquema import converter_data, normalizar_data, separar_participantes
+
+# Importação e exportação de eventos em CSV e iCalendar (.ics).
+# Leitura e escrita são feitas com geradores, linha a linha, para que
+# arquivos grandes sejam processados com memória limitada.
+
+# Colunas do CSV exportado; na importação também são aceitos os nomes em inglês
+COLUNAS_CSV = ['titulo', 'inicio', 'fim', 'departamento', 'participantes', 'descricao']
+_SINONIMOS_CSV = {
+    'titulo': ('titulo', 'título', 'title'),
+    'inicio': ('inicio', 'início', 'start'),
+    'fim': ('fim', 'end'),
+    'departamento': ('departamento', 'department'),
+    'participantes': ('participantes', 'participants'),
+    'descricao': ('descricao', 'descrição', 'description'),
+}
+# Separador dos participantes dentro da coluna do CSV
+SEPARADOR_PARTICIPANTES_CSV = ';'
+
+# Propriedade própria usada para o departamento no .ics (além de CATEGORIES)
+PROPRIEDADE_DEPARTAMENTO_ICS = 'X-ALFREDO-DEPARTAMENTO'
+
+# Fuso dos horários da aplicação (sem fuso, no horário local). Datas do .ics em
+# UTC ('Z') ou com TZID são convertidas para ele na importação.
+FUSO_HORARIO = ZoneInfo(os.environ.get('ALFREDO_FUSO_HORARIO', 'America/Sao_Paulo'))
+
+
+class ErroImportacao(ValueError):
+    """Linha ou evento inválido no arquivo importado."""
+
+
+def ler_csv(linhas):
+    """Gera eventos a partir das linhas de um CSV (cabeçalho na primeira linha)."""
+    leitor = csv.DictReader(linhas)
+    colunas = {}
+    for nome in leitor.fieldnames or []:
+        for campo, sinonimos in _SINONIMOS_CSV.items():
+            if nome.strip().lower() in sinonimos:
+                colunas[campo] = nome
+    for linha in leitor:
+        valor = {campo: (linha.get(nome) or '').strip() for campo, nome in colunas.items()}
+        participantes = valor.get('participantes', '').replace(SEPARADOR_PARTICIPANTES_CSV, ',')
+        yield {
+            'title': valor.get('titulo', ''),
+            'start': valor.get('inicio', ''),
+            'end': valor.get('fim', ''),
+            'departamento': valor.get('departamento') or None,
+            'participantes': separar_participantes(participantes),
+            'description': valor.get('descricao', ''),
+        }
+
+
+def _desdobrar(linhas):
+    # Linhas do iCalendar que começam com espaço ou tab continuam a anterior
+    atual = None
+    for linha in linhas:
+        linha = linha.rstrip('\r\n')
+        if linha[:1] in (' ', '\t') and atual is not None:
+            atual += linha[1:]
+            continue
+        if atual is not None:
+            yield atual
+        atual = linha
+    if atual:
+        yield atual
+
+
+# Sequências de escape de TEXT na RFC 5545, desfeitas numa única passada para
+# que '\\n' (barra escapada seguida de 'n') não vire uma quebra de linha
+_ESCAPE_ICS = re.compile(r'\\([\\;,nN])')
+
+
+def _desescapar(texto):
+    return _ESCAPE_ICS.sub(lambda m: '\n' if m.group(1) in 'nN' else m.group(1), texto)
+
+
+def _escapar(texto):
+    return (texto or '').replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,').replace('\n', '\\n')
+
+
+def _fuso_ics(parametros):
+    # TZID com nome IANA; nomes desconhecidos (ex.: fusos do Windows) valem como horário local
+    for parametro in parametros:
+        if parametro.upper().startswith('TZID='):
+            try:
+                return ZoneInfo(parametro[5:].strip('"'))
+            except (ZoneInfoNotFoundError, ValueError):
+                return None
+    return None
+
+
+def _data_ics(valor, parametros=()):
+    # DTSTART: 20250512T140000 (horário local), 20250512T140000Z (UTC),
+    # DTSTART;TZID=America/New_York:20250512T140000 ou 20250512 (dia inteiro)
+    formato = '%Y%m%dT%H%M%S' if 'T' in valor else '%Y%m%d'
+    data = datetime.strptime(valor.rstrip('Z'), formato)
+    fuso = timezone.utc if valor.endswith('Z') else _fuso_ics(parametros)
+    if fuso is not None and 'T' in valor:
+        data = data.replace(tzinfo=fuso).astimezone(FUSO_HORARIO).replace(tzinfo=None)
+    return normalizar_data(data)
+
+
+def ler_ics(linhas):
+    """Gera eventos a partir das linhas de um arquivo iCalendar (VEVENT)."""
+    evento = None
+    for linha in _desdobrar(linhas):
+        nome, _, valor = linha.partition(':')
+        propriedade, *parametros = nome.split(';')
+        propriedade = propriedade.upper()
+        if propriedade == 'BEGIN' and valor.upper() == 'VEVENT':
+            evento = {'title': '', 'start': '', 'end': '', 'departamento': None,
+                      'participantes': [], 'description': ''}
+        elif evento is None:
+            continue
+        elif propriedade == 'END' and valor.upper() == 'VEVENT':
+            yield evento
+            evento = None
+        elif propriedade == 'SUMMARY':
+            evento['title'] = _desescapar(valor)
+        elif propriedade in ('DTSTART', 'DTEND'):
+            try:
+                evento['start' if propriedade == 'DTSTART' else 'end'] = _data_ics(valor, parametros)
+            except ValueError:
+                pass
+        elif propriedade == 'DESCRIPTION':
+            evento['description'] = _desescapar(valor)
+        elif propriedade == PROPRIEDADE_DEPARTAMENTO_ICS or (propriedade == 'CATEGORIES' and not evento['departamento']):
+            evento['departamento'] = _desescapar(valor.split(',')[0]) or None
+        elif propriedade == 'ATTENDEE':
+            nomes = [parametro[3:] for parametro in parametros if parametro.upper().startswith('CN=')]
+            nome_participante = (nomes[0] if nomes else valor.split(':')[-1]).strip('"')
+            if nome_participante:
+                evento['participantes'].append(nome_participante)
+
+
+def validar_campos(evento, departamentos):
+    """Confere campos obrigatórios, datas e departamento. Levanta ErroImportacao."""
+    if not evento.get('title'):
+        raise ErroImportacao("título vazio")
+    try:
+        inicio, fim = converter_data(evento['start']), converter_data(evento['end'])
+    except (KeyError, TypeError, ValueError):
+        raise ErroImportacao("data de início ou fim inválida")
+    if fim <= inicio:
+        raise ErroImportacao("o fim deve ser posterior ao início")
+    if evento.get('departamento') not in departamentos:
+        raise ErroImportacao(f"departamento desconhecido: {evento.get('departamento')!r}")
+    return {**evento, 'start': normalizar_data(inicio), 'end': normalizar_data(fim)}
+
+
+def linhas_csv(eventos):
+    """Gera as linhas de um CSV com os eventos, começando pelo cabeçalho."""
+    buffer = io.StringIO()
+    escritor = csv.writer(buffer)
+    escritor.writerow(COLUNAS_CSV)
+    for evento in eventos:
+        escritor.writerow([evento.get('title'), evento['start'], evento['end'], evento.get('departamento') or '',
+                           SEPARADOR_PARTICIPANTES_CSV.join(evento.get('participantes') or []),
+                           evento.get('description') or ''])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def _linha_ics(linha):
+    # Linhas com mais de 75 octetos (em UTF-8) são dobradas, como pede a RFC 5545,
+    # sem partir um caractere no meio. As continuações começam com um espaço.
+    partes, atual, tamanho, limite = [], [], 0, 75
+    for caractere in linha:
+        octetos = len(caractere.encode('utf-8'))
+        if tamanho + octetos > limite:
+            partes.append(''.join(atual))
+            atual, tamanho, limite = [], 0, 74
+        atual.append(caractere)
+        tamanho += octetos
+    partes.append(''.join(atual))
+    return '\r\n '.join(partes) + '\r\n'
+
+
+def linhas_ics(eventos):
+    """Gera as linhas de um arquivo iCalendar com os eventos."""
+    yield _linha_ics('BEGIN:VCALENDAR')
+    yield _linha_ics('VERSION:2.0')
+    yield _linha_ics('PRODID:-//Alfredo Augustinus//PT-BR')
+    carimbo = datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+    for evento in eventos:
+        yield _linha_ics('BEGIN:VEVENT')
+        yield _linha_ics(f"UID:{evento['id']}@alfredo")
+        yield _linha_ics(f"DTSTAMP:{carimbo}")
+        yield _linha_ics(f"DTSTART:{converter_data(evento['start']).strftime('%Y%m%dT%H%M%S')}")
+        yield _linha_ics(f"DTEND:{converter_data(evento['end']).strftime('%Y%m%dT%H%M%S')}")
+        yield _linha_ics(f"SUMMARY:{_escapar(evento.get('title'))}")
+        if evento.get('description'):
+            yield _linha_ics(f"DESCRIPTION:{_escapar(evento['description'])}")
+        if evento.get('departamento'):
+            yield _linha_ics(f"CATEGORIES:{_escapar(evento['departamento'])}")
+            yield _linha_ics(f"{PROPRIEDADE_DEPARTAMENTO_ICS}:{_escapar(evento['departamento'])}")
+        for nome in evento.get('participantes') or []:
+            yield _linha_ics(f'ATTENDEE;CN="{nome}":mailto:nao-informado@invalid')
+        yield _linha_ics('END:VEVENT')
+    yield _linha_ics('END:VCALENDAR')
@@ -0,0 +1,67 @@
+from bisect import bisect_left, insort
+from datetime import timedelta
+
+
+class IndiceIntervalos:
+    """
+    Índice de intervalos [início, fim) agrupados por chave e por dia.
+
+    Cada chave (um participante ou um departamento) tem, para cada dia, uma
+    lista ordenada pelo início. Guardando a maior duração de cada dia, a busca
+    por sobreposição é feita com bisect: só são examinados os intervalos que
+    começam entre (início - maior duração) e o fim consultado.
+    """
+
+    def __init__(self):
+        # chave -> dia -> {'itens': [(inicio, fim, id)], 'maior_duracao': timedelta}
+        self._baldes = {}
+
+    @staticmethod
+    def _dias(inicio, fim):
+        dia = inicio.date()
+        ultimo = (fim - timedelta(microseconds=1)).date() if fim > inicio else dia
+        while dia <= ultimo:
+            yield dia
+            dia += timedelta(days=1)
+
+    def adicionar(self, chave, inicio, fim, evento_id):
+        por_dia = self._baldes.setdefault(chave, {})
+        for dia in self._dias(inicio, fim):
+            balde = por_dia.setdefault(dia, {'itens': [], 'maior_duracao': timedelta(0)})
+            insort(balde['itens'], (inicio, fim, evento_id))
+            balde['maior_duracao'] = max(balde['maior_duracao'], fim - inicio)
+
+    def remover(self, chave, inicio, fim, evento_id):
+        por_dia = self._baldes.get(chave)
+        if por_dia is None:
+            return
+        for dia in self._dias(inicio, fim):
+            balde = por_dia.get(dia)
+            if balde is None:
+                continue
+            itens = balde['itens']
+            posicao = bisect_left(itens, (inicio, fim, evento_id))
+            if posicao < len(itens) and itens[posicao] == (inicio, fim, evento_id):
+                itens.pop(posicao)
+            if not itens:
+                del por_dia[dia]
+        if not por_dia:
+            del self._baldes[chave]
+
+    def sobrepostos(self, chave, inicio, fim):
+        """Ids dos intervalos da chave que se sobrepõem a [inicio, fim)."""
+        encontrados = set()
+        por_dia = self._baldes.get(chave)
+        if not por_dia:
+            return encontrados
+        for dia in self._dias(inicio, fim):
+            balde = por_dia.get(dia)
+            if balde is None:
+                continue
+            itens = balde['itens']
+            primeiro = bisect_left(itens, (inicio - balde['maior_duracao'],))
+            ultimo = bisect_left(itens, (fim,))
+            for item_inicio, item_fim, evento_id in itens[primeiro:ultimo]:
+                if item_inicio < fim and item_fim > inicio:
+                    encontrados.add(evento_id)
+        return encontrados
@@ -0,0 +1,105 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
+# Número de medições recentes usadas nos percentis de cada fase
+JANELA_METRICAS = int(os.environ.get('ALFREDO_JANELA_METRICAS', 500))
+
+# Pasta onde as métricas são exportadas
+PASTA_METRICAS = os.environ.get(
+    'ALFREDO_METRICAS',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'metricas')
+)
+
+PERCENTIS = (50, 90, 99)
+
+
+def _percentil(ordenados, p):
+    # Interpolação linear entre os vizinhos mais próximos
+    posicao = (len(ordenados) - 1) * p / 100
+    abaixo = int(posicao)
+    acima = min(abaixo + 1, len(ordenados) - 1)
+    return ordenados[abaixo] + (ordenados[acima] - ordenados[abaixo]) * (posicao - abaixo)
+
+
+class Metricas:
+    """
+    Tempos (ms) por fase de execução, compartilhados pelo processo.
+
+    Para cada fase são mantidas as últimas JANELA_METRICAS medições (para os
+    percentis) e os totais acumulados desde o início do processo.
+    """
+
+    def __init__(self, janela=JANELA_METRICAS):
+        self._janela = janela
+        self._lock = threading.Lock()
+        self._recentes = {}
+        self._totais = {}
+
+    def registrar(self, fase, duracao_ms):
+        with self._lock:
+            self._recentes.setdefault(fase, deque(maxlen=self._janela)).append(duracao_ms)
+            quantidade, soma = self._totais.get(fase, (0, 0.0))
+            self._totais[fase] = (quantidade + 1, soma + duracao_ms)
+
+    @contextmanager
+    def medir(self, fase):
+        """Mede o bloco (ou a função decorada) e registra o tempo na fase."""
+        inicio = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.registrar(fase, (time.perf_counter() - inicio) * 1000)
+
+    def resumo(self):
+        """{fase: {'amostras', 'p50', 'p90', 'p99', 'max', 'total', 'soma_ms'}} ordenado por fase."""
+        with self._lock:
+            recentes = {fase: sorted(valores) for fase, valores in self._recentes.items()}
+            totais = dict(self._totais)
+        resumo = {}
+        for fase in sorted(recentes):
+            valores = recentes[fase]
+            resumo[fase] = {
+                'amostras': len(valores),
+                **{f'p{p}': _percentil(valores, p) for p in PERCENTIS},
+                'max': valores[-1],
+                'total': totais[fase][0],
+                'soma_ms': totais[fase][1],
+            }
+        return resumo
+
+    def para_prometheus(self):
+        """Resumo no formato de texto do Prometheus (summary por fase)."""
+        linhas = ['# HELP alfredo_fase_duracao_ms Duração das fases de execução em milissegundos.',
+                  '# TYPE alfredo_fase_duracao_ms summary']
+        for fase, dados in self.resumo().items():
+            for p in PERCENTIS:
+                linhas.append(f'alfredo_fase_duracao_ms{{fase="{fase}",quantile="{p / 100}"}} {dados[f"p{p}"]:.3f}')
+            linhas.append(f'alfredo_fase_duracao_ms_sum{{fase="{fase}"}} {dados["soma_ms"]:.3f}')
+            linhas.append(f'alfredo_fase_duracao_ms_count{{fase="{fase}"}} {dados["total"]}')
+        return '\n'.join(linhas) + '\n'
+
+    def exportar(self, formato='prometheus', pasta=PASTA_METRICAS):
+        """Grava as métricas em 'pasta' ('prometheus' ou 'json') e retorna o caminho."""
+        os.makedirs(pasta, exist_ok=True)
+        if formato == 'json':
+            caminho = os.path.join(pasta, 'metricas.json')
+            conteudo = json.dumps({'gerado_em': datetime.now().isoformat(timespec='seconds'),
+                                   'fases': self.resumo()}, ensure_ascii=False, indent=2)
+        else:
+            caminho = os.path.join(pasta, 'metricas.prom')
+            conteudo = self.para_prometheus()
+        temporario = caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            f.write(conteudo)
+        os.replace(temporario, caminho)
+        return caminho
+
+
+# Instância do processo, usada pelas páginas e pela fila de escrita
+metricas = Metricas()
+medir = metricas.medir
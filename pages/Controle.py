@@ -1,47 +1,63 @@
 import streamlit as st
 from datetime import datetime
-from departamentos import departamentos
 import sys
 import os
 import pandas as pd
 import plotly.express as px
 
-# Adiciona o diretório pai ao path para importar funções do Alfredo.py
+# Adiciona o diretório pai ao path para importar os módulos da aplicação
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from Alfredo import carregar_eventos
+from servico_eventos import (
+    obter_store, planejar_campanha_mes, agendar_campanha, carregar_cobertura, ler_token_versao, aguardar_gravacoes
+)
+from referencia import obter_referencia
+from campanha import MODELO_TITULO_PADRAO, DURACAO_UNIDADES, DURACAO_AREAS
+from cobertura import matriz_da_tabela, matriz_do_resumo, percentual_mensal, percentual_historico, cobertura_do_mes
+from metricas import medir
 
 st.title("Controle de Reuniões por Departamento")
 
+# Departamentos e colaboradores atuais (recarregados quando a fonte muda)
+referencia = obter_referencia()
+departamentos = referencia.departamentos
+
+# Anos mostrados no histórico de cobertura
+ANOS_HISTORICO = 5
+
+# Matriz departamento × (ano, mês) dos últimos ANOS_HISTORICO anos, lida do resumo
+# 'cobertura_mensal' (não dos eventos) e recalculada apenas quando o token de
+# versão ou os departamentos mudam. Sem conexão, é montada a partir dos eventos
+# do ano atual carregados no cache.
+@medir('controle_agregacao')
+def obter_matriz_cobertura():
+    ano_atual = datetime.now().year
+    ano_inicio = ano_atual - ANOS_HISTORICO + 1
+    token = ler_token_versao()
+    chave = (ano_inicio, token, referencia)
+    cache = st.session_state.get('matriz_cobertura')
+    if token is not None and cache is not None and cache[0] == chave:
+        return cache[1]
+    resumo = carregar_cobertura(ano_inicio, ano_atual) if token is not None else None
+    if resumo is not None:
+        linhas, ocorrencias = resumo
+        matriz = matriz_do_resumo(linhas, departamentos, ocorrencias)
+        st.session_state.matriz_cobertura = (chave, matriz)
+        return matriz
+    store = obter_store(datetime(ano_atual, 1, 1), datetime(ano_atual + 1, 1, 1))
+    return matriz_da_tabela(store.tabela(), departamentos)
+
+# Lida uma única vez por rerun (cada leitura consulta o token de versão no banco)
+matriz = obter_matriz_cobertura()
+
 # Função para calcular o percentual de agendamentos por mês
 def calcular_percentual_mensal():
-    # Carregar eventos se não estiverem na sessão
-    if 'events' not in st.session_state:
-        st.session_state.events = carregar_eventos()
-    
-    # Inicializar dicionário para contar reuniões por mês
     meses_dict = {
         1: "Janeiro", 2: "Fevereiro", 3: "Março", 4: "Abril", 
         5: "Maio", 6: "Junho", 7: "Julho", 8: "Agosto", 
         9: "Setembro", 10: "Outubro", 11: "Novembro", 12: "Dezembro"
     }
     
-    # Inicializar contadores
-    total_departamentos = len(departamentos)
-    reunioes_por_mes = {mes: 0 for mes in range(1, 13)}
-    
-    # Ano atual
-    ano_atual = datetime.now().year
-    
-    # Contar reuniões por mês para cada departamento
-    for dept in departamentos:
-        for mes in range(1, 13):
-            if tem_reuniao_agendada_por_mes(dept, mes, ano_atual):
-                reunioes_por_mes[mes] += 1
-    
-    # Calcular percentuais
-    percentuais = {}
-    for mes, count in reunioes_por_mes.items():
-        percentuais[mes] = (count / total_departamentos) * 100 if total_departamentos > 0 else 0
+    percentuais = percentual_mensal(matriz, datetime.now().year)
     
     # Criar DataFrame para o gráfico
     df = pd.DataFrame({
@@ -51,29 +67,6 @@ def calcular_percentual_mensal():
     
     return df
 
-# Função para verificar se há reunião agendada para o departamento em um mês específico do ano especificado
-def tem_reuniao_agendada_por_mes(departamento, mes, ano):
-    if 'events' not in st.session_state:
-        return False
-        
-    for evento in st.session_state.events:
-        # Tratamento para diferentes formatos de data
-        try:
-            # Tenta converter a data do evento para objeto datetime
-            if 'Z' in evento['start']:
-                data_evento = datetime.fromisoformat(evento['start'].replace('Z', '+00:00'))
-            else:
-                data_evento = datetime.fromisoformat(evento['start'])
-                
-            # Verifica se o evento é do departamento, mês e ano corretos
-            if (data_evento.month == mes and 
-                data_evento.year == ano and
-                f"Departamento: {departamento}" in evento['description']):
-                return True
-        except (ValueError, KeyError) as e:
-            continue
-    return False
-
 # Criar e exibir o gráfico de evolução mensal
 df_percentuais = calcular_percentual_mensal()
 fig = px.line(
@@ -99,6 +92,21 @@ fig.update_layout(
 )
 st.plotly_chart(fig, use_container_width=True)
 
+# Histórico: um ponto por mês dos últimos anos, lido do mesmo resumo
+with st.expander(f"Histórico de cobertura (últimos {ANOS_HISTORICO} anos)"):
+    ano_atual = datetime.now().year
+    ano_inicio_historico = ano_atual - ANOS_HISTORICO + 1
+    historico = percentual_historico(matriz, ano_inicio_historico, ano_atual)
+    df_historico = pd.DataFrame({
+        'Mês': [f"{mes:02d}/{ano}" for ano, mes in historico.index],
+        'Percentual': historico.to_numpy(),
+    })
+    fig_historico = px.line(df_historico, x='Mês', y='Percentual', markers=True,
+                            title='Percentual de Departamentos com Reunião por Mês')
+    fig_historico.update_layout(xaxis_title='Mês', yaxis_title='Percentual de Departamentos (%)',
+                                yaxis=dict(range=[0, 100]), height=400)
+    st.plotly_chart(fig_historico, use_container_width=True)
+
 # Filtro de mês
 meses = [
     "Janeiro", "Fevereiro", "Março", "Abril", "Maio", "Junho",
@@ -119,40 +127,16 @@ mes_selecionado = st.selectbox(
 # Converte nome do mês para número (1-12)
 mes_numero = meses.index(mes_selecionado) + 1
 
-# Inicializa eventos se não estiverem na sessão
-if 'events' not in st.session_state:
-    st.session_state.events = carregar_eventos()
-
-# Função para verificar se há reunião agendada para o departamento no mês
-def tem_reuniao_agendada(departamento, mes):
-    if 'events' not in st.session_state:
-        return False
-        
-    for evento in st.session_state.events:
-        # Tratamento para diferentes formatos de data
-        try:
-            # Tenta converter a data do evento para objeto datetime
-            if 'Z' in evento['start']:
-                data_evento = datetime.fromisoformat(evento['start'].replace('Z', '+00:00'))
-            else:
-                data_evento = datetime.fromisoformat(evento['start'])
-                
-            # Verifica se o evento é do departamento e mês corretos
-            if (data_evento.month == mes and 
-                f"Departamento: {departamento}" in evento['description']):
-                return True
-        except (ValueError, KeyError) as e:
-            st.error(f"Erro ao processar evento: {e}")
-            continue
-    return False
+# Status de cada departamento no mês selecionado, lido da matriz de cobertura
+status_mes = cobertura_do_mes(matriz, mes_numero, datetime.now().year)
 
 # Calcula o percentual de reuniões agendadas
 total_departamentos = len(departamentos)
-departamentos_com_reuniao = sum(1 for dept in departamentos if tem_reuniao_agendada(dept, mes_numero))
+departamentos_com_reuniao = int(status_mes.sum())
 percentual = (departamentos_com_reuniao / total_departamentos) * 100 if total_departamentos > 0 else 0
 
 # Exibe o indicador de progresso
-st.header(f"Status das Reuniões - {mes_selecionado}")
+st.header(f"Status das Reuniões - {mes_selecionado} de {datetime.now().year}")
 col_prog1, col_prog2 = st.columns([1, 3])
 with col_prog1:
     st.metric("Progresso", f"{percentual:.1f}%")
@@ -170,50 +154,97 @@ with col_stats3:
 
 st.divider()
 
-# Cria colunas para a tabela
-col1, col2, col3 = st.columns([2, 1, 2])
-
-# Cabeçalho da tabela
-with col1:
-    st.subheader("Departamento")
-with col2:
-    st.subheader("Status")
-with col3:
-    st.subheader("Ações")
+# Status de todos os departamentos em um único DataFrame; o filtro e a
+# seleção acontecem nele, com um único widget de tabela
+coluna_mes = (datetime.now().year, mes_numero)
+status_df = pd.DataFrame({
+    'Agendar': False,
+    'Departamento': status_mes.index,
+    'Status': ["✓ Agendada" if agendada else "⚠ Pendente" for agendada in status_mes],
+    'Reuniões': matriz[coluna_mes].to_numpy() if coluna_mes in matriz.columns else 0,
+})
 
-# Linha divisória
-st.divider()
-
-# Adicione o filtro de status antes da listagem dos departamentos
 opcoes_filtro = ["Todos", "Apenas Agendadas", "Apenas Pendentes"]
 filtro_status = st.selectbox("Filtrar departamentos por status", opcoes_filtro)
+if filtro_status == "Apenas Agendadas":
+    status_df = status_df[status_mes.to_numpy()]
+elif filtro_status == "Apenas Pendentes":
+    status_df = status_df[~status_mes.to_numpy()]
 
-# Lista os departamentos e seus status
-for dept in departamentos:
-    tem_reuniao = tem_reuniao_agendada(dept, mes_numero)
-    
-    # Aplica o filtro escolhido
-    if filtro_status == "Apenas Agendadas" and not tem_reuniao:
-        continue
-    if filtro_status == "Apenas Pendentes" and tem_reuniao:
-        continue
+tabela = st.data_editor(
+    status_df,
+    hide_index=True,
+    use_container_width=True,
+    disabled=['Departamento', 'Status', 'Reuniões'],
+    column_config={
+        'Agendar': st.column_config.CheckboxColumn("Agendar", help="Selecione um departamento pendente"),
+    },
+    key=f"tabela_status_{mes_numero}_{filtro_status}",
+)
 
-    col1, col2, col3 = st.columns([2, 1, 2])
-    
-    with col1:
-        st.write(dept)
-    
-    with col2:
-        if tem_reuniao:
-            st.success("✓ Agendada")
-        else:
-            st.warning("⚠ Pendente")
-    
-    with col3:
-        if not tem_reuniao:
-            if st.button("Agendar Reunião", key=f"btn_{dept}"):
-                st.session_state.departamento_selecionado = dept
-                st.switch_page("Alfredo.py")
+# Agendamento a partir da linha selecionada
+selecionados = tabela.loc[tabela['Agendar'], 'Departamento'].tolist()
+pendentes_selecionados = [dept for dept in selecionados if not status_mes[dept]]
+if selecionados and not pendentes_selecionados:
+    st.info("O departamento selecionado já tem reunião agendada neste mês.")
+if pendentes_selecionados:
+    dept = pendentes_selecionados[0]
+    if st.button(f"Agendar Reunião - {dept}", key="btn_agendar"):
+        st.session_state.departamento_selecionado = dept
+        st.switch_page("Alfredo.py")
+
+# Campanha: uma reunião para cada departamento pendente, gravadas de uma vez
+pendentes = [dept for dept in status_mes.index if not status_mes[dept]]
+if pendentes:
+    with st.expander(f"Agendar campanha para os {len(pendentes)} departamentos pendentes"):
+        modelo_titulo = st.text_input("Título (aceita {departamento}, {ano} e {mes})", value=MODELO_TITULO_PADRAO)
+        col_dur1, col_dur2 = st.columns(2)
+        with col_dur1:
+            duracao_unidades = st.number_input("Duração para unidades CSA (horas)", min_value=0.5,
+                                               max_value=8.0, value=DURACAO_UNIDADES, step=0.5)
+        with col_dur2:
+            duracao_areas = st.number_input("Duração para as demais áreas (horas)", min_value=0.5,
+                                            max_value=8.0, value=DURACAO_AREAS, step=0.5)
+        participantes_fixos = st.multiselect("Participantes presentes em todas as reuniões",
+                                             sorted(referencia.colaboradores))
+        descricao_campanha = st.text_area("Descrição das reuniões")
+
+        if st.button("Pré-visualizar campanha"):
+            try:
+                planejados, sem_horario = planejar_campanha_mes(
+                    pendentes, referencia.colaboradores_do_departamento, datetime.now().year, mes_numero,
+                    modelo_titulo=modelo_titulo, descricao=descricao_campanha,
+                    duracao_unidades=duracao_unidades, duracao_areas=duracao_areas,
+                    participantes_fixos=participantes_fixos
+                )
+                st.session_state.plano_campanha = (mes_numero, planejados, sem_horario)
+            except (KeyError, IndexError, ValueError) as e:
+                st.error(f"Modelo de título inválido: {e}")
+
+        plano = st.session_state.get('plano_campanha')
+        if plano is not None and plano[0] == mes_numero:
+            _, planejados, sem_horario = plano
+            if planejados:
+                st.dataframe(pd.DataFrame({
+                    'Departamento': [evento['departamento'] for evento in planejados],
+                    'Título': [evento['title'] for evento in planejados],
+                    'Início': [datetime.fromisoformat(evento['start']).strftime('%d/%m/%Y %H:%M') for evento in planejados],
+                    'Fim': [datetime.fromisoformat(evento['end']).strftime('%H:%M') for evento in planejados],
+                    'Participantes': [', '.join(evento['participantes']) for evento in planejados],
+                }), hide_index=True, use_container_width=True)
+            if sem_horario:
+                st.warning(f"Sem horário livre no mês: {', '.join(sem_horario)}")
+            if planejados and st.button(f"Confirmar e agendar {len(planejados)} reuniões"):
+                agendados, descartados = agendar_campanha(planejados)
+                del st.session_state.plano_campanha
+                # O resumo de cobertura só muda depois da gravação
+                aguardar_gravacoes()
+                st.success(f"{len(agendados)} reuniões agendadas.")
+                if descartados:
+                    st.warning(f"{len(descartados)} reuniões não foram agendadas porque o horário foi ocupado "
+                               "depois da pré-visualização: "
+                               f"{', '.join(evento['departamento'] for evento in descartados)}")
+                st.rerun()
 
 
 # Configuração de tema e cores
@@ -0,0 +1,155 @@
+from bson import ObjectId
+from pymongo import InsertOne, ReplaceOne, DeleteOne
+
+# Operações de escrita incrementais sobre a coleção 'eventos'.
+# Cada operação é uma tupla (tipo, evento):
+#   ('inserir', evento)   -> insere um novo documento (versão 1)
+#   ('atualizar', evento) -> substitui o documento se ele ainda estiver na
+#                            versão evento['versao'] - 1 (compare-and-swap)
+#   ('excluir', evento)   -> remove o documento se ele ainda estiver na
+#                            versão evento['versao']
+INSERIR = 'inserir'
+ATUALIZAR = 'atualizar'
+EXCLUIR = 'excluir'
+
+
+def novo_id():
+    """Gera um id estável para um evento (string de um ObjectId)."""
+    return str(ObjectId())
+
+
+def _para_object_id(evento_id):
+    return ObjectId(evento_id) if ObjectId.is_valid(evento_id) else evento_id
+
+
+def documento_para_evento(documento):
+    """Converte um documento do MongoDB no dicionário usado pela aplicação."""
+    evento = {}
+    for chave, valor in documento.items():
+        if chave == '_id':
+            evento['id'] = str(valor)
+        elif isinstance(valor, ObjectId):
+            evento[chave] = str(valor)
+        else:
+            evento[chave] = valor
+    return evento
+
+
+def evento_para_documento(evento):
+    """Converte um evento da aplicação em documento do MongoDB (id -> _id)."""
+    documento = {chave: valor for chave, valor in evento.items() if chave != 'id'}
+    documento['_id'] = _para_object_id(evento['id'])
+    return documento
+
+
+def buscar_evento(collection, evento_id, projecao=None):
+    """Lê um único evento pelo id (None se ele não existir mais)."""
+    documento = collection.find_one({'_id': _para_object_id(evento_id)}, projecao)
+    return documento_para_evento(documento) if documento else None
+
+
+# Filtro que só encontra o documento na versão esperada
+def _filtro_versao(evento, versao_esperada):
+    return {'_id': _para_object_id(evento['id']), 'versao': versao_esperada}
+
+
+def _para_operacao_mongo(tipo, evento):
+    if tipo == INSERIR:
+        return InsertOne(evento_para_documento(evento))
+    if tipo == ATUALIZAR:
+        return ReplaceOne(_filtro_versao(evento, evento['versao'] - 1), evento_para_documento(evento))
+    if tipo == EXCLUIR:
+        return DeleteOne(_filtro_versao(evento, evento['versao']))
+    raise ValueError(f"Tipo de operação desconhecido: {tipo}")
+
+
+def aplicar_operacoes(collection, operacoes):
+    """
+    Grava apenas o que mudou.
+
+    Atualizações e exclusões só se aplicam se o documento ainda estiver na
+    versão esperada. Retorna a lista de ids em conflito (documentos alterados
+    ou removidos por outro usuário), um por id.
+    """
+    return ids_em_conflito(operacoes, aplicar_com_resultados(collection, operacoes))
+
+
+def ids_em_conflito(operacoes, aplicadas):
+    """Ids das operações não aplicadas, sem repetição, na ordem das operações."""
+    conflitos = []
+    for (_, evento), aplicada in zip(operacoes, aplicadas):
+        if not aplicada and evento['id'] not in conflitos:
+            conflitos.append(evento['id'])
+    return conflitos
+
+
+# Separa o lote em rodadas com no máximo uma operação por id, mantendo a ordem
+# das operações de cada id: a rodada n tem a n-ésima operação de cada evento
+def _rodadas(operacoes):
+    rodadas = []
+    quantidade_por_id = {}
+    for posicao, (_, evento) in enumerate(operacoes):
+        rodada = quantidade_por_id.get(evento['id'], 0)
+        quantidade_por_id[evento['id']] = rodada + 1
+        if rodada == len(rodadas):
+            rodadas.append([])
+        rodadas[rodada].append(posicao)
+    return rodadas
+
+
+def aplicar_com_resultados(collection, operacoes):
+    """
+    Grava as operações e diz quais foram aplicadas (lista de bool, uma por operação).
+
+    Uma única operação vira insert_one/replace_one/delete_one; várias viram um
+    bulk_write ordenado por rodada, cada rodada com no máximo uma operação por
+    id, de modo que o estado final de cada documento diz se a operação dele
+    foi aplicada. Operações do mesmo id formam uma cadeia de versões: depois
+    da primeira que falha, as seguintes não são enviadas e também ficam como
+    não aplicadas.
+    """
+    if len(operacoes) == 1:
+        tipo, evento = operacoes[0]
+        if tipo == INSERIR:
+            collection.insert_one(evento_para_documento(evento))
+            return [True]
+        if tipo == ATUALIZAR:
+            resultado = collection.replace_one(_filtro_versao(evento, evento['versao'] - 1),
+                                               evento_para_documento(evento))
+            return [bool(resultado.matched_count)]
+        if tipo == EXCLUIR:
+            resultado = collection.delete_one(_filtro_versao(evento, evento['versao']))
+            return [bool(resultado.deleted_count)]
+        raise ValueError(f"Tipo de operação desconhecido: {tipo}")
+
+    aplicadas = [False] * len(operacoes)
+    interrompidos = set()
+    for rodada in _rodadas(operacoes):
+        rodada = [posicao for posicao in rodada if operacoes[posicao][1]['id'] not in interrompidos]
+        if not rodada:
+            continue
+        resultado = collection.bulk_write(
+            [_para_operacao_mongo(*operacoes[posicao]) for posicao in rodada], ordered=True
+        )
+        for posicao in rodada:
+            aplicadas[posicao] = True
+        esperados = sum(1 for posicao in rodada if operacoes[posicao][0] != INSERIR)
+        if resultado.matched_count + resultado.deleted_count == esperados:
+            continue
+
+        # Algumas operações não encontraram a versão esperada: como cada id
+        # aparece uma única vez na rodada, o estado atual diz quais foram
+        ids = [_para_object_id(operacoes[posicao][1]['id']) for posicao in rodada
+               if operacoes[posicao][0] != INSERIR]
+        versoes = {str(documento['_id']): documento.get('versao')
+                   for documento in collection.find({'_id': {'$in': ids}}, {'versao': 1})}
+        for posicao in rodada:
+            tipo, evento = operacoes[posicao]
+            if tipo == ATUALIZAR:
+                aplicadas[posicao] = versoes.get(evento['id']) == evento['versao']
+            elif tipo == EXCLUIR:
+                # O documento continua lá, em outra versão
+                aplicadas[posicao] = evento['id'] not in versoes
+            if not aplicadas[posicao]:
+                interrompidos.add(evento['id'])
+    return aplicadas
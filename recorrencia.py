@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta
+from dateutil.rrule import rrulestr
+from esquema import converter_data, normalizar_data
+
+# Reuniões recorrentes são gravadas como um único documento (a regra), com o
+# formato de um evento mais o campo:
+#   'recorrencia': {'regra': 'FREQ=...;UNTIL=...', 'excecoes': [inícios ISO cancelados]}
+# 'start' e 'end' da regra são os da primeira ocorrência. As ocorrências não
+# são gravadas: são geradas apenas para o intervalo exibido, com id
+# '<id da regra>@<início>' e o campo 'regra_id'.
+
+SEPARADOR_OCORRENCIA = '@'
+
+# Opções de repetição oferecidas no formulário
+FREQUENCIAS = {
+    "Semanal": "FREQ=WEEKLY",
+    "Quinzenal": "FREQ=WEEKLY;INTERVAL=2",
+    "Mensal": "FREQ=MONTHLY",
+}
+
+# Horizonte (dias) da verificação de conflitos de uma nova série sem data final
+HORIZONTE_VERIFICACAO = 365
+
+
+def id_ocorrencia(regra_id, inicio):
+    return f"{regra_id}{SEPARADOR_OCORRENCIA}{normalizar_data(inicio)}"
+
+
+def separar_id_ocorrencia(evento_id):
+    """Retorna (regra_id, início ISO) de uma ocorrência, ou None para eventos simples."""
+    if SEPARADOR_OCORRENCIA not in (evento_id or ''):
+        return None
+    regra_id, inicio = evento_id.split(SEPARADOR_OCORRENCIA, 1)
+    return regra_id, inicio
+
+
+def criar_regra(evento, frequencia, ate=None):
+    """Transforma 'evento' (primeira ocorrência) em uma regra com a frequência RRULE dada."""
+    regra = frequencia
+    if ate is not None:
+        limite = datetime.combine(ate, datetime.max.time()).replace(microsecond=0)
+        regra += f";UNTIL={limite.strftime('%Y%m%dT%H%M%S')}"
+    return {**evento, 'recorrencia': {'regra': regra, 'excecoes': []}}
+
+
+def com_excecao(regra, inicio):
+    """Cópia da regra com a ocorrência de 'inicio' cancelada."""
+    recorrencia = dict(regra['recorrencia'])
+    recorrencia['excecoes'] = sorted(set(recorrencia.get('excecoes') or []) | {normalizar_data(inicio)})
+    return {**regra, 'recorrencia': recorrencia}
+
+
+def _rrule(regra):
+    return rrulestr(regra['recorrencia']['regra'], dtstart=converter_data(regra['start']))
+
+
+def ocorrencias(regra, inicio, fim):
+    """Ocorrências da regra que começam em [inicio, fim), exceto as canceladas."""
+    primeiro = converter_data(regra['start'])
+    duracao = converter_data(regra['end']) - primeiro
+    excecoes = set(regra['recorrencia'].get('excecoes') or [])
+    campos = {chave: valor for chave, valor in regra.items() if chave not in ('id', 'recorrencia')}
+    resultado = []
+    for momento in _rrule(regra).between(converter_data(inicio), converter_data(fim), inc=True):
+        inicio_iso = normalizar_data(momento)
+        if momento >= converter_data(fim) or inicio_iso in excecoes:
+            continue
+        resultado.append({
+            **campos,
+            'id': id_ocorrencia(regra['id'], momento),
+            'start': inicio_iso,
+            'end': normalizar_data(momento + duracao),
+            'regra_id': regra['id'],
+        })
+    return resultado
+
+
+def ocorrencias_para_verificacao(regra):
+    """Ocorrências usadas para verificar conflitos ao criar a série (até o fim ou o horizonte)."""
+    inicio = converter_data(regra['start'])
+    return ocorrencias(regra, inicio, inicio + timedelta(days=HORIZONTE_VERIFICACAO))
@@ -0,0 +1,223 @@
+import argparse
+import json
+import os
+import threading
+import time
+import streamlit as st
+
+# Dados de referência: departamentos e colaboradores (com seus departamentos).
+# São lidos de um documento no MongoDB ou de um arquivo JSON local e
+# recarregados quando a versão do documento ou a data de modificação do
+# arquivo muda, sem reiniciar a aplicação. Sem nenhuma das fontes, valem os
+# módulos departamentos.py e colaboradores_por_departamento.py.
+#
+# Formato (arquivo e documento):
+#   {"versao": 3, "departamentos": [...], "colaboradores": {"Nome": ["Depto", ...]}}
+
+# Arquivo local com os dados de referência
+CAMINHO_REFERENCIA = os.environ.get(
+    'ALFREDO_REFERENCIA',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'referencia.json')
+)
+
+# Coleção e documento no MongoDB; o campo 'versao' deve ser incrementado a cada alteração
+COLECAO_REFERENCIA = 'referencia'
+ID_REFERENCIA = 'organizacao'
+
+# Intervalo mínimo (segundos) entre verificações de mudança nas fontes
+INTERVALO_VERIFICACAO = float(os.environ.get('ALFREDO_REFERENCIA_INTERVALO', 5))
+
+
+class DadosReferencia:
+    """
+    Departamentos e colaboradores com índices nos dois sentidos.
+
+    Os índices são montados uma única vez na carga; as consultas são buscas
+    em dicionário. Os objetos não são alterados depois de criados.
+    """
+
+    def __init__(self, departamentos, colaboradores, versao=None, origem=None):
+        self.versao = versao
+        self.origem = origem
+        self.departamentos = list(departamentos)
+        # Pessoa -> departamentos
+        self.colaboradores = {nome: list(deps) for nome, deps in colaboradores.items()}
+        # Departamento -> pessoas, na ordem do cadastro
+        self._por_departamento = {departamento: [] for departamento in self.departamentos}
+        for nome, deps in self.colaboradores.items():
+            for departamento in deps:
+                self._por_departamento.setdefault(departamento, []).append(nome)
+        self._conjunto = frozenset(self.departamentos)
+
+    def __contains__(self, departamento):
+        return departamento in self._conjunto
+
+    def colaboradores_do_departamento(self, departamento):
+        return self._por_departamento.get(departamento, [])
+
+    def departamentos_do_colaborador(self, nome):
+        return self.colaboradores.get(nome, [])
+
+    def para_dicionario(self):
+        return {'versao': self.versao, 'departamentos': self.departamentos, 'colaboradores': self.colaboradores}
+
+
+def dados_padrao():
+    """Dados dos módulos departamentos.py e colaboradores_por_departamento.py."""
+    from departamentos import departamentos
+    from colaboradores_por_departamento import colaboradores_por_departamento
+    return DadosReferencia(departamentos, colaboradores_por_departamento, versao=0, origem="módulos locais")
+
+
+class FonteArquivo:
+    """Arquivo JSON local; a versão é a data de modificação do arquivo."""
+
+    def __init__(self, caminho=CAMINHO_REFERENCIA):
+        self.caminho = caminho
+
+    def versao(self):
+        try:
+            return os.stat(self.caminho).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def carregar(self, versao):
+        with open(self.caminho, encoding='utf-8') as f:
+            dados = json.load(f)
+        return DadosReferencia(dados['departamentos'], dados['colaboradores'], versao=versao,
+                               origem=f"arquivo {os.path.basename(self.caminho)}")
+
+
+class FonteMongo:
+    """Documento ID_REFERENCIA da coleção COLECAO_REFERENCIA; a versão é o campo 'versao'."""
+
+    def __init__(self, obter_banco):
+        # Recebe a função que devolve o banco, para conectar só quando necessário
+        self._obter_banco = obter_banco
+
+    def _colecao(self):
+        return self._obter_banco()[COLECAO_REFERENCIA]
+
+    def versao(self):
+        documento = self._colecao().find_one({'_id': ID_REFERENCIA}, {'versao': 1})
+        return documento.get('versao', 0) if documento else None
+
+    def carregar(self, versao):
+        documento = self._colecao().find_one({'_id': ID_REFERENCIA})
+        return DadosReferencia(documento['departamentos'], documento['colaboradores'],
+                               versao=documento.get('versao', versao), origem="MongoDB")
+
+    def publicar(self, dados):
+        """Grava os dados no documento, incrementando a versão."""
+        self._colecao().update_one(
+            {'_id': ID_REFERENCIA},
+            {'$set': {'departamentos': dados.departamentos, 'colaboradores': dados.colaboradores},
+             '$inc': {'versao': 1}},
+            upsert=True
+        )
+
+
+class ServicoReferencia:
+    """
+    Mantém os dados de referência atuais, consultando as fontes em ordem.
+
+    Usa a primeira fonte disponível (versão diferente de None). Só recarrega
+    quando a fonte ou a versão muda, e verifica no máximo uma vez a cada
+    'intervalo' segundos. Erros de uma fonte fazem passar para a seguinte.
+    As fontes são consultadas fora do lock: enquanto uma sessão verifica,
+    as demais recebem os dados atuais sem esperar pelo banco de dados.
+    """
+
+    def __init__(self, fontes, intervalo=INTERVALO_VERIFICACAO):
+        self._fontes = list(fontes)
+        self._intervalo = intervalo
+        self._lock = threading.Lock()
+        self._dados = None
+        self._chave = None
+        self._verificado_em = 0.0
+        self._verificando = False
+
+    def obter(self):
+        with self._lock:
+            agora = time.monotonic()
+            if self._dados is not None and (self._verificando or agora - self._verificado_em < self._intervalo):
+                return self._dados
+            self._verificado_em = agora
+            self._verificando = True
+            chave_atual = self._chave
+        try:
+            chave, dados = self._consultar(chave_atual)
+        finally:
+            with self._lock:
+                self._verificando = False
+        with self._lock:
+            if dados is not None:
+                self._dados, self._chave = dados, chave
+            return self._dados
+
+    # Consulta as fontes em ordem; devolve (chave, dados), com dados None se
+    # a fonte e a versão continuam as mesmas de 'chave_atual'
+    def _consultar(self, chave_atual):
+        for indice, fonte in enumerate(self._fontes):
+            try:
+                versao = fonte.versao()
+                if versao is None:
+                    continue
+                if (indice, versao) == chave_atual:
+                    return chave_atual, None
+                return (indice, versao), fonte.carregar(versao)
+            except Exception:
+                continue
+        if chave_atual == 'padrao':
+            return chave_atual, None
+        return 'padrao', dados_padrao()
+
+    def recarregar(self):
+        """Força a verificação das fontes no próximo acesso."""
+        with self._lock:
+            self._verificado_em = 0.0
+
+
+def _fontes():
+    from armazenamento import TIPO_ARMAZENAMENTO
+    fontes = []
+    if TIPO_ARMAZENAMENTO == 'mongodb':
+        from conexao import obter_banco
+        fontes.append(FonteMongo(obter_banco))
+    fontes.append(FonteArquivo())
+    return fontes
+
+
+# Serviço compartilhado por todas as sessões do processo
+@st.cache_resource(show_spinner=False)
+def obter_servico_referencia():
+    return ServicoReferencia(_fontes())
+
+
+def obter_referencia():
+    """Dados de referência atuais (recarregados se a fonte mudou)."""
+    return obter_servico_referencia().obter()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Publica os dados de referência (departamentos e colaboradores).")
+    parser.add_argument('destino', choices=['arquivo', 'mongodb'],
+                        help="Grava os dados de departamentos.py e colaboradores_por_departamento.py "
+                             "no arquivo local ou no MongoDB")
+    parser.add_argument('--caminho', default=CAMINHO_REFERENCIA)
+    argumentos = parser.parse_args()
+    dados = dados_padrao()
+    if argumentos.destino == 'arquivo':
+        temporario = argumentos.caminho + '.tmp'
+        with open(temporario, 'w', encoding='utf-8') as f:
+            json.dump(dados.para_dicionario(), f, ensure_ascii=False, indent=2)
+        os.replace(temporario, argumentos.caminho)
+        print(f"Dados de referência gravados em {argumentos.caminho}")
+    else:
+        from conexao import obter_banco, ESPERA_CONEXAO_LINHA_DE_COMANDO
+        FonteMongo(lambda: obter_banco(espera=ESPERA_CONEXAO_LINHA_DE_COMANDO)).publicar(dados)
+        print("Dados de referência publicados no MongoDB")
+
+
+if __name__ == '__main__':
+    main()
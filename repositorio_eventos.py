@@ -0,0 +1,167 @@
+import threading
+from datetime import timedelta
+from functools import wraps
+from esquema import converter_data, normalizar_evento
+from intervalos import IndiceIntervalos
+from persistencia import novo_id
+from tabela_eventos import TabelaEventos
+
+
+# Chaves do índice de intervalos: cada participante e o departamento do evento
+def chaves_conflito(participantes, departamento):
+    chaves = [('participante', nome) for nome in participantes]
+    if departamento:
+        chaves.append(('departamento', departamento))
+    return chaves
+
+
+# Chave (ano, mês) a partir do início ISO normalizado ("YYYY-MM-DDTHH:MM:SS")
+def chave_mes(evento):
+    try:
+        inicio = evento['start']
+        return int(inicio[0:4]), int(inicio[5:7])
+    except (KeyError, TypeError, ValueError):
+        return None
+
+
+# Meses (ano, mês) que o intervalo [inicio, fim) toca
+def meses_do_intervalo(inicio, fim):
+    ultimo = fim - timedelta(microseconds=1)
+    ano, mes = inicio.year, inicio.month
+    meses = []
+    while (ano, mes) <= (ultimo.year, ultimo.month):
+        meses.append((ano, mes))
+        ano, mes = (ano + 1, 1) if mes == 12 else (ano, mes + 1)
+    return meses
+
+
+# Executa o método com o lock do store (o store é compartilhado entre sessões)
+def _sincronizado(metodo):
+    @wraps(metodo)
+    def envoltorio(self, *args, **kwargs):
+        with self._lock:
+            return metodo(self, *args, **kwargs)
+    return envoltorio
+
+
+class EventStore:
+    """
+    Eventos indexados por id estável.
+
+    Mantém um índice principal id -> evento, de modo que busca, edição e
+    exclusão são O(1) independentemente do tamanho do calendário. Um índice de intervalos por
+    participante e departamento responde às verificações de conflito em
+    tempo logarítmico e é atualizado evento a evento. As consultas por mês e
+    por intervalo usam uma TabelaEventos (colunar), recriada apenas quando a
+    versão do store muda. Todas as operações públicas são protegidas por um
+    lock, pois o mesmo store atende várias sessões.
+    """
+
+    def __init__(self, eventos=None):
+        self._lock = threading.RLock()
+        self._eventos = {}
+        self._intervalos = IndiceIntervalos()
+        self._tabela = None
+        # Incrementada a cada alteração; permite reaproveitar cálculos derivados
+        self.versao = 0
+        for evento in eventos or []:
+            self.adicionar(evento)
+
+    def __len__(self):
+        return len(self._eventos)
+
+    def __iter__(self):
+        return iter(self.todos())
+
+    def __contains__(self, evento_id):
+        return evento_id in self._eventos
+
+    @_sincronizado
+    def todos(self):
+        return list(self._eventos.values())
+
+    def obter(self, evento_id):
+        return self._eventos.get(evento_id)
+
+    @staticmethod
+    def _intervalo(evento):
+        try:
+            return converter_data(evento['start']), converter_data(evento['end'])
+        except (KeyError, TypeError, ValueError):
+            return None
+
+    def _indexar(self, evento):
+        intervalo = self._intervalo(evento)
+        if intervalo is not None:
+            for chave in chaves_conflito(evento['participantes'], evento.get('departamento')):
+                self._intervalos.adicionar(chave, *intervalo, evento['id'])
+
+    def _desindexar(self, evento):
+        intervalo = self._intervalo(evento)
+        if intervalo is not None:
+            for chave in chaves_conflito(evento['participantes'], evento.get('departamento')):
+                self._intervalos.remover(chave, *intervalo, evento['id'])
+
+    @_sincronizado
+    def adicionar(self, evento):
+        """Adiciona um evento, atribuindo um id se ele ainda não tiver um."""
+        evento = normalizar_evento({**evento, 'id': evento.get('id') or novo_id()})
+        if evento['id'] in self._eventos:
+            self._desindexar(self._eventos[evento['id']])
+        self._eventos[evento['id']] = evento
+        self._indexar(evento)
+        self.versao += 1
+        return evento
+
+    @_sincronizado
+    def atualizar(self, evento_id, evento_atualizado):
+        """Substitui o evento mantendo o id. Retorna None se o id não existir."""
+        antigo = self._eventos.get(evento_id)
+        if antigo is None:
+            return None
+        self._desindexar(antigo)
+        evento = normalizar_evento({**evento_atualizado, 'id': evento_id})
+        self._eventos[evento_id] = evento
+        self._indexar(evento)
+        self.versao += 1
+        return evento
+
+    @_sincronizado
+    def remover(self, evento_id):
+        """Remove e retorna o evento, ou None se o id não existir."""
+        evento = self._eventos.pop(evento_id, None)
+        if evento is not None:
+            self._desindexar(evento)
+            self.versao += 1
+        return evento
+
+    @_sincronizado
+    def tabela(self):
+        """TabelaEventos com os eventos atuais, recriada só quando a versão muda."""
+        if self._tabela is None or self._tabela[0] != self.versao:
+            self._tabela = (self.versao, TabelaEventos(self._eventos.values()))
+        return self._tabela[1]
+
+    def por_mes(self, mes, ano=None):
+        """Eventos do mês (de qualquer ano quando 'ano' não é informado), ordenados pelo início."""
+        tabela = self.tabela()
+        return tabela.eventos(tabela.do_mes(mes, ano))
+
+    def no_intervalo(self, inicio, fim):
+        """Eventos que se sobrepõem a [inicio, fim), ordenados pelo início."""
+        tabela = self.tabela()
+        return tabela.eventos(tabela.no_intervalo(inicio, fim))
+
+    @_sincronizado
+    def conflitos(self, inicio, fim, participantes=(), departamento=None, ignorar_id=None):
+        """
+        Eventos que se sobrepõem a [inicio, fim) e envolvem algum dos
+        participantes ou o mesmo departamento, ordenados pelo início.
+        'ignorar_id' exclui o próprio evento na edição.
+        """
+        inicio, fim = converter_data(inicio), converter_data(fim)
+        ids = set()
+        for chave in chaves_conflito(participantes, departamento):
+            ids |= self._intervalos.sobrepostos(chave, inicio, fim)
+        ids.discard(ignorar_id)
+        return sorted((self._eventos[i] for i in ids), key=lambda evento: evento['start'])
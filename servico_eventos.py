@@ -0,0 +1,540 @@
+import hashlib
+import uuid
+from contextlib import nullcontext
+from functools import partial
+from datetime import datetime, timedelta
+import streamlit as st
+from conexao import obter_banco, obter_cliente, estado_conexao, registrar_falha, registrar_reconexao
+from persistencia import INSERIR, ATUALIZAR, EXCLUIR, novo_id
+from esquema import converter_data, normalizar_evento
+from armazenamento import ArmazenamentoMongo, ArmazenamentoSQLite, TIPO_ARMAZENAMENTO, CAMINHO_SQLITE
+from cache_eventos import CacheEventos, inicio_mes_seguinte
+from fila_escrita import FilaEscrita
+import diario
+from metricas import medir
+from repositorio_eventos import meses_do_intervalo, chaves_conflito
+from horarios_livres import ocupacao_por_chave, horarios_livres
+from campanha import planejar_campanha
+from recorrencia import separar_id_ocorrencia, com_excecao, ocorrencias_para_verificacao, ocorrencias as ocorrencias_da_regra
+from importacao import validar_campos, ErroImportacao
+
+# Armazenamento configurado (ALFREDO_ARMAZENAMENTO): MongoDB Atlas, com o
+# cliente criado uma única vez por processo (ver conexao.py), ou SQLite local.
+# Levanta exceção se o banco não estiver acessível; não usa chamadas do Streamlit.
+# Com o circuito da conexão aberto, a exceção é imediata (sem esperar timeouts).
+def criar_armazenamento():
+    if TIPO_ARMAZENAMENTO == 'sqlite':
+        return _armazenamento_sqlite(CAMINHO_SQLITE)
+    obter_cliente()
+    return _armazenamento_mongo()
+
+@st.cache_resource(show_spinner=False)
+def _armazenamento_mongo():
+    armazenamento = ArmazenamentoMongo(obter_banco(), ao_falhar=registrar_falha)
+    # O resumo de cobertura é conferido em segundo plano; cobertura() é só leitura
+    armazenamento.reparar_cobertura_periodicamente()
+    return armazenamento
+
+@st.cache_resource(show_spinner=False)
+def _armazenamento_sqlite(caminho):
+    return ArmazenamentoSQLite(caminho)
+
+# Indica se o armazenamento já foi conectado e preparado neste processo
+_armazenamento_preparado = False
+
+# Retorna o armazenamento pronto para uso, ou None se não estiver acessível.
+# Enquanto a primeira conexão com o MongoDB ainda está em andamento (em segundo
+# plano) apenas informa que os dados locais estão em uso. A fase 'conexao' só
+# mede a conexão e a preparação de fato (não as chamadas já em cache, nem as
+# recusas imediatas com o circuito aberto).
+def obter_armazenamento():
+    global _armazenamento_preparado
+    try:
+        if _armazenamento_preparado:
+            return criar_armazenamento()
+        medindo = TIPO_ARMAZENAMENTO == 'sqlite' or estado_conexao() != 'aberto'
+        with medir('conexao') if medindo else nullcontext():
+            armazenamento = criar_armazenamento()
+            preparar_armazenamento(armazenamento)
+        _armazenamento_preparado = True
+        return armazenamento
+    except Exception as e:
+        if TIPO_ARMAZENAMENTO != 'sqlite' and estado_conexao() == 'conectando':
+            st.info("Conectando ao MongoDB Atlas; usando os dados locais até a conexão ser estabelecida.")
+            return None
+        nome = 'SQLite local' if TIPO_ARMAZENAMENTO == 'sqlite' else 'MongoDB Atlas'
+        st.error(f"Erro ao conectar ao {nome}: {str(e)}")
+        st.warning("Usando banco de dados local como fallback.")
+        return None
+
+# Preparação executada uma vez por processo: índices, migração do formato
+# antigo e carga inicial dos dados locais quando o banco está vazio
+@st.cache_resource(show_spinner=False)
+def preparar_armazenamento(_armazenamento):
+    _armazenamento.preparar(eventos_locais())
+    return True
+
+# Eventos locais (banco_eventos.py), usados como fallback. O id é derivado do
+# conteúdo para que cargas repetidas (e a carga inicial no MongoDB) coincidam.
+def eventos_locais():
+    import banco_eventos
+    eventos = []
+    for evento in banco_eventos.eventos_db:
+        id_local = hashlib.md5(f"{evento['title']}|{evento['start']}".encode('utf-8')).hexdigest()[:24]
+        eventos.append(normalizar_evento({**evento, 'id': evento.get('id') or id_local}))
+    return eventos
+
+# Função para carregar eventos do banco de dados
+# Carrega apenas os eventos que começam em [inicio, fim), usando o índice por data
+@medir('carregar_eventos')
+def carregar_eventos(inicio, fim):
+    inicio_iso, fim_iso = inicio.isoformat(), fim.isoformat()
+    try:
+        armazenamento = obter_armazenamento()
+        if armazenamento is not None:
+            # Alterações ainda não sincronizadas do diário local prevalecem
+            return diario.aplicar_em_eventos(armazenamento.carregar(inicio_iso, fim_iso), inicio_iso, fim_iso)
+        else:
+            # Fallback para o arquivo local se não conseguir conectar ao MongoDB
+            st.warning("Usando banco de dados local como fallback.")
+    except Exception as e:
+        st.error(f"Erro ao carregar eventos: {e}")
+    # Garantir que sempre retorne uma lista, mesmo em caso de erro
+    return diario.aplicar_em_eventos(
+        [evento for evento in eventos_locais() if inicio_iso <= evento['start'] < fim_iso],
+        inicio_iso, fim_iso
+    )
+
+# Regras de reuniões recorrentes (poucas; lidas inteiras e expandidas pelo cache)
+def carregar_regras():
+    try:
+        armazenamento = obter_armazenamento()
+        if armazenamento is not None:
+            return diario.aplicar_em_regras(armazenamento.regras())
+    except Exception as e:
+        st.error(f"Erro ao carregar reuniões recorrentes: {e}")
+    return diario.aplicar_em_regras([])
+
+# Resumo de cobertura (reuniões por departamento e mês) de [ano_inicio, ano_fim],
+# lido de 'cobertura_mensal'. As ocorrências das reuniões recorrentes não entram
+# no resumo e são devolvidas à parte. Retorna (linhas, ocorrencias), ou None
+# sem conexão com o banco de dados.
+@medir('carregar_cobertura')
+def carregar_cobertura(ano_inicio, ano_fim):
+    try:
+        armazenamento = obter_armazenamento()
+        if armazenamento is None:
+            return None
+        linhas = armazenamento.cobertura(ano_inicio, ano_fim)
+    except Exception as e:
+        st.error(f"Erro ao carregar o resumo de cobertura: {e}")
+        return None
+    inicio, fim = datetime(ano_inicio, 1, 1), datetime(ano_fim + 1, 1, 1)
+    ocorrencias = [ocorrencia for regra in carregar_regras() for ocorrencia in ocorrencias_da_regra(regra, inicio, fim)]
+    return linhas, ocorrencias
+
+# Função para salvar eventos no banco de dados
+# Recebe apenas as alterações (lista de operações de persistencia.py), de modo
+# que o custo de cada gravação depende do tamanho da mudança, não do calendário.
+# Retorna os ids em conflito de versão; esses eventos são recarregados do banco.
+def salvar_eventos(operacoes):
+    conflitos = []
+    try:
+        armazenamento = obter_armazenamento()
+        if armazenamento is not None:
+            conflitos = gravar_lote(obter_cache_eventos(), armazenamento, operacoes)
+            if conflitos is None:
+                informar_resultado({'gravados': 0, 'conflitos': [], 'erro': None, 'pendentes': len(operacoes)})
+                return []
+            informar_resultado({'gravados': len(operacoes) - len(conflitos), 'conflitos': conflitos, 'erro': None,
+                                'pendentes': 0})
+        else:
+            # Sem conexão: as alterações vão para o diário local (uma linha por
+            # operação) e são enviadas ao banco de dados quando a conexão voltar
+            try:
+                diario.registrar(operacoes)
+                st.warning("Sem conexão com o banco de dados. As alterações foram registradas localmente "
+                           "e serão sincronizadas quando a conexão voltar.")
+            except Exception as diario_error:
+                st.error(f"Erro ao registrar alterações localmente: {diario_error}")
+    except Exception as e:
+        st.error(f"Erro ao salvar eventos: {str(e)}")
+        st.exception(e)  # Mostra o traceback completo do erro
+    return conflitos
+
+# Grava um lote de operações e mantém o cache coerente. Usada tanto na gravação
+# síncrona quanto pela fila em segundo plano, por isso não usa chamadas do
+# Streamlit. Eventos em conflito são recarregados do banco, um a um.
+# Retorna os ids em conflito, ou None se a gravação falhou e as operações
+# ficaram no diário local para serem sincronizadas depois.
+@medir('salvar')
+def gravar_lote(cache, armazenamento, operacoes):
+    try:
+        conflitos = armazenamento.aplicar(operacoes)
+    except Exception:
+        # As operações podem não ter chegado ao banco: ficam no diário local
+        # (a reprodução é idempotente) e o cache é recarregado. Só um erro ao
+        # gravar o próprio diário é propagado.
+        try:
+            diario.registrar(operacoes)
+        finally:
+            cache.descartar()
+        return None
+    if len(operacoes) > len(conflitos):
+        cache.registrar_escrita(incrementar_token_versao(armazenamento))
+    for evento_id in conflitos:
+        atual = armazenamento.buscar(evento_id)
+        if (atual or {}).get('recorrencia') or cache.obter_regra(evento_id):
+            cache.substituir_regra(evento_id, atual)
+        else:
+            cache.substituir_evento(evento_id, atual)
+    return conflitos
+
+# Mostra o resultado de uma gravação (síncrona ou vinda da fila)
+def informar_resultado(resultado):
+    if resultado['erro']:
+        st.error(f"Erro ao salvar eventos: {resultado['erro']}")
+        return
+    if resultado.get('pendentes'):
+        st.warning(f"Sem conexão com o banco de dados. {resultado['pendentes']} alteração(ões) foram registradas "
+                   "localmente e serão sincronizadas quando a conexão voltar.")
+    if resultado['gravados']:
+        st.success(f"Eventos salvos com sucesso! {resultado['gravados']} evento(s) gravado(s) no banco de dados.")
+    if resultado['conflitos']:
+        st.error(f"{len(resultado['conflitos'])} reunião(ões) foram alteradas ou canceladas por outro usuário "
+                 "enquanto você editava. Os dados atuais foram recarregados; revise e tente novamente.")
+
+# Fila de gravação em segundo plano, compartilhada pelo processo
+@st.cache_resource(show_spinner=False)
+def obter_fila_escrita():
+    return FilaEscrita(partial(gravar_lote, obter_cache_eventos()))
+
+# Identificador da sessão, usado para devolver o resultado das gravações
+def id_sessao():
+    if 'id_sessao' not in st.session_state:
+        st.session_state.id_sessao = uuid.uuid4().hex
+    return st.session_state.id_sessao
+
+# Exibe os resultados das gravações em segundo plano concluídas desde o último rerun
+def exibir_resultados_escrita():
+    for resultado in obter_fila_escrita().resultados(id_sessao()):
+        informar_resultado(resultado)
+
+# Espera a fila gravar tudo o que foi enviado (ex.: antes de ler o resumo de
+# cobertura logo depois de agendar uma campanha)
+def aguardar_gravacoes():
+    obter_fila_escrita().aguardar()
+
+# Envia as operações para a fila sem bloquear o rerun. Sem conexão (backup
+# local) ou com a fila cheia, grava de forma síncrona.
+def enviar_operacoes(operacoes):
+    armazenamento = obter_armazenamento()
+    if armazenamento is not None and obter_fila_escrita().enfileirar(id_sessao(), armazenamento, operacoes):
+        return
+    salvar_eventos(operacoes)
+
+# Token de versão dos eventos, incrementado a cada escrita.
+# Permite que outros processos saibam que o cache ficou desatualizado.
+def ler_token_versao():
+    try:
+        return criar_armazenamento().ler_token()
+    except Exception:
+        return None
+
+def incrementar_token_versao(armazenamento):
+    try:
+        return armazenamento.incrementar_token()
+    except Exception:
+        return None
+
+# Cache de eventos compartilhado por todas as sessões do processo
+@st.cache_resource(show_spinner=False)
+def obter_cache_eventos():
+    cache = CacheEventos()
+    if TIPO_ARMAZENAMENTO != 'sqlite':
+        # Enquanto o MongoDB esteve fora o cache pode ter sido montado com o
+        # fallback local: é conferido de novo assim que a conexão volta
+        registrar_reconexao(cache.invalidar)
+    return cache
+
+# Envia ao banco de dados as alterações do diário local feitas sem conexão.
+# Chamada antes de acessar o cache; só consulta o banco se houver pendências.
+def sincronizar_diario():
+    if not diario.tem_pendencias():
+        return
+    armazenamento = obter_armazenamento()
+    if armazenamento is None:
+        return
+    try:
+        aplicados, conflitos = diario.reproduzir(armazenamento)
+    except Exception as e:
+        st.error(f"Erro ao sincronizar alterações locais: {e}")
+        return
+    incrementar_token_versao(armazenamento)
+    obter_cache_eventos().descartar()
+    if aplicados:
+        st.success(f"{aplicados} alteração(ões) feita(s) sem conexão sincronizada(s) com o banco de dados.")
+    if conflitos:
+        st.warning(f"{len(conflitos)} alteração(ões) feita(s) sem conexão não foram aplicadas porque a "
+                   "reunião foi modificada por outro usuário.")
+
+# EventStore compartilhado. Garante que os meses de [inicio, fim) estejam
+# carregados; sem intervalo, devolve o que já foi carregado.
+def obter_store(inicio=None, fim=None):
+    if inicio is not None:
+        sincronizar_diario()
+    meses = meses_do_intervalo(inicio, fim) if inicio is not None else []
+    return obter_cache_eventos().obter_store(meses, carregar_eventos, ler_token_versao, carregar_regras)
+
+# Verifica conflitos de horário para os participantes e o departamento do evento.
+# Mostra o primeiro conflito encontrado e o retorna (ou None se não houver).
+@medir('verificar_conflito')
+def verificar_conflito(evento, ignorar_id=None):
+    inicio, fim = converter_data(evento['start']), converter_data(evento['end'])
+    # Carrega também o mês anterior, para reuniões que começam antes da virada do mês
+    conflitos = obter_store(inicio - timedelta(days=1), fim).conflitos(
+        evento['start'], evento['end'],
+        participantes=evento.get('participantes') or [],
+        departamento=evento.get('departamento'),
+        ignorar_id=ignorar_id
+    )
+    if not conflitos:
+        return None
+    conflito = conflitos[0]
+    st.error(f"""Conflito de horário detectado:
+             \nReunião: {conflito['title']}
+             \nHorário: {converter_data(conflito['start']).strftime('%H:%M')} - {converter_data(conflito['end']).strftime('%H:%M')}""")
+    return conflito
+
+# Sugere os primeiros horários livres para os participantes e o departamento,
+# procurando nos 'dias' a partir de data_inicio. Retorna lista de (inicio, fim).
+@medir('sugerir_horarios')
+def sugerir_horarios(participantes, departamento, data_inicio, duracao_horas, dias=14, quantidade=5):
+    inicio = datetime.combine(data_inicio, datetime.min.time())
+    fim = inicio + timedelta(days=dias)
+    # Um dia antes, para reuniões que começam antes da janela e terminam dentro dela
+    eventos = obter_store(inicio - timedelta(days=1), fim).conflitos(
+        inicio.isoformat(), fim.isoformat(), participantes=participantes, departamento=departamento
+    )
+    ocupacao = ocupacao_por_chave(eventos, chaves_conflito(participantes, departamento))
+    return horarios_livres(ocupacao, data_inicio, (fim - timedelta(days=1)).date(), duracao_horas,
+                           quantidade=quantidade, agora=datetime.now())
+
+# Planeja (sem gravar) uma reunião por departamento pendente no mês
+def planejar_campanha_mes(pendentes, colaboradores_do_departamento, ano, mes, **opcoes):
+    inicio = datetime(ano, mes, 1)
+    fim = inicio_mes_seguinte(ano, mes)
+    # Um dia antes, para reuniões que começam antes da virada do mês
+    eventos = obter_store(inicio - timedelta(days=1), fim).no_intervalo(inicio, fim)
+    return planejar_campanha(eventos, pendentes, colaboradores_do_departamento, ano, mes,
+                             agora=datetime.now(), **opcoes)
+
+# Grava as reuniões planejadas em uma única escrita. Reuniões que passaram a
+# conflitar depois da pré-visualização são descartadas e devolvidas à parte.
+# Os meses das reuniões são carregados antes da verificação (o cache pode ter
+# sido recarregado desde a pré-visualização).
+def agendar_campanha(eventos):
+    if not eventos:
+        return [], []
+    store = obter_store(min(converter_data(evento['start']) for evento in eventos) - timedelta(days=1),
+                        max(converter_data(evento['end']) for evento in eventos))
+    agendados, descartados = [], []
+    for evento in eventos:
+        if store.conflitos(evento['start'], evento['end'], participantes=evento['participantes'],
+                           departamento=evento['departamento']):
+            descartados.append(evento)
+        else:
+            agendados.append(store.adicionar(evento))
+    if agendados:
+        enviar_operacoes([(INSERIR, evento) for evento in agendados])
+    return agendados, descartados
+
+# Tamanho dos lotes de gravação na importação de arquivos
+TAMANHO_LOTE_IMPORTACAO = 500
+# Quantos eventos rejeitados são guardados (com o motivo) para exibição
+LIMITE_REJEITADOS = 100
+
+# Importa os eventos gerados por importacao.ler_csv/ler_ics. Primeiro valida os
+# campos e o departamento de cada linha; depois sincroniza e carrega o store uma
+# única vez, para o período de todos os eventos válidos, e verifica os conflitos
+# (inclusive com os importados antes no mesmo arquivo). Os aceitos são enviados
+# em lotes de 'tamanho_lote' operações.
+# Retorna (importados, total_rejeitados, [(número, título, motivo)]).
+@medir('importar')
+def importar_eventos(eventos, departamentos, tamanho_lote=TAMANHO_LOTE_IMPORTACAO):
+    departamentos = set(departamentos)
+    validos, total_rejeitados, rejeitados = [], 0, []
+
+    def rejeitar(numero, evento, motivo):
+        nonlocal total_rejeitados
+        total_rejeitados += 1
+        if len(rejeitados) < LIMITE_REJEITADOS:
+            rejeitados.append((numero, evento.get('title'), motivo))
+
+    for numero, evento in enumerate(eventos, start=1):
+        try:
+            validos.append((numero, validar_campos(evento, departamentos)))
+        except ErroImportacao as e:
+            rejeitar(numero, evento, str(e))
+    lote, importados = [], 0
+    if validos:
+        # Um dia antes, para reuniões que começam antes da virada do mês
+        inicio = min(converter_data(evento['start']) for _, evento in validos)
+        fim = max(converter_data(evento['end']) for _, evento in validos)
+        store = obter_store(inicio - timedelta(days=1), fim)
+    rejeitados_validacao, rejeitados = rejeitados, []
+    for numero, evento in validos:
+        conflitos = store.conflitos(evento['start'], evento['end'],
+                                    participantes=evento.get('participantes') or [],
+                                    departamento=evento.get('departamento'))
+        if conflitos:
+            rejeitar(numero, evento, f"conflito com '{conflitos[0]['title']}'")
+            continue
+        lote.append((INSERIR, store.adicionar(evento)))
+        if len(lote) >= tamanho_lote:
+            enviar_operacoes(lote)
+            importados += len(lote)
+            lote = []
+    if lote:
+        enviar_operacoes(lote)
+        importados += len(lote)
+    # Os rejeitados das duas etapas voltam na ordem das linhas do arquivo
+    rejeitados = sorted(rejeitados_validacao + rejeitados)[:LIMITE_REJEITADOS]
+    return importados, total_rejeitados, rejeitados
+
+# Gera os eventos de [inicio, fim) para exportação, mês a mês e em ordem de
+# início, sem passar pelo cache compartilhado: só um mês fica em memória.
+# Inclui as ocorrências das reuniões recorrentes.
+def eventos_para_exportacao(inicio, fim, departamento=None):
+    regras = carregar_regras()
+    for ano, mes in meses_do_intervalo(inicio, fim):
+        inicio_mes = max(datetime(ano, mes, 1), inicio)
+        fim_mes = min(inicio_mes_seguinte(ano, mes), fim)
+        eventos = carregar_eventos(inicio_mes, fim_mes)
+        for regra in regras:
+            eventos.extend(ocorrencias_da_regra(regra, inicio_mes, fim_mes))
+        for evento in sorted(eventos, key=lambda evento: evento['start']):
+            if departamento is None or evento.get('departamento') == departamento:
+                yield evento
+
+# Função para salvar evento individual
+# As funções abaixo aplicam a alteração no store imediatamente (otimista) e
+# enviam a gravação para a fila; conflitos de versão detectados depois são
+# informados no próximo rerun e o evento afetado é recarregado do banco.
+def salvar_evento(evento):
+    evento = obter_store().adicionar(evento)
+    enviar_operacoes([(INSERIR, evento)])
+    return evento
+
+# Cria uma série recorrente (regra de recorrencia.py). Verifica conflitos em
+# todas as ocorrências do primeiro ano e grava apenas o documento da regra.
+def salvar_recorrencia(regra):
+    regra = normalizar_evento({**regra, 'id': novo_id(), 'versao': 1})
+    ocorrencias = ocorrencias_para_verificacao(regra)
+    if ocorrencias:
+        # Carrega de uma vez todos os meses cobertos pelas ocorrências
+        obter_store(converter_data(ocorrencias[0]['start']) - timedelta(days=1),
+                    converter_data(ocorrencias[-1]['end']))
+        for ocorrencia in ocorrencias:
+            if verificar_conflito(ocorrencia) is not None:
+                st.error(f"A ocorrência de {converter_data(ocorrencia['start']).strftime('%d/%m/%Y')} "
+                         "conflita com outra reunião. A série não foi agendada.")
+                return None
+    obter_cache_eventos().substituir_regra(regra['id'], regra)
+    enviar_operacoes([(INSERIR, regra)])
+    return regra
+
+# Regra atual de uma ocorrência, conferindo a versão aberta pelo usuário
+def _regra_da_ocorrencia(regra_id, versao_esperada):
+    regra = obter_cache_eventos().obter_regra(regra_id)
+    if regra is None or (versao_esperada is not None and regra['versao'] != versao_esperada):
+        informar_conflito_versao()
+        return None
+    return regra
+
+# Cancela a série inteira de uma reunião recorrente
+def excluir_serie(regra_id, versao_esperada=None):
+    regra = _regra_da_ocorrencia(regra_id, versao_esperada)
+    if regra is None:
+        return False
+    obter_cache_eventos().substituir_regra(regra_id, None)
+    enviar_operacoes([(EXCLUIR, regra)])
+    return True
+
+# Store e evento atual pelo id. Se o cache foi recarregado desde que a página
+# foi montada, o mês do evento pode não estar carregado: o evento é lido do
+# banco e o seu mês é carregado. Retorna (store, None) se ele não existe mais.
+def _evento_atual(evento_id):
+    store = obter_store()
+    atual = store.obter(evento_id)
+    if atual is not None:
+        return store, atual
+    armazenamento = obter_armazenamento()
+    no_banco = armazenamento.buscar(evento_id) if armazenamento is not None else None
+    if no_banco is None:
+        return store, None
+    store = obter_store(converter_data(no_banco['start']) - timedelta(days=1), converter_data(no_banco['end']))
+    return store, store.obter(evento_id)
+
+# Mensagem para quando o evento mudou desde que o usuário o abriu
+def informar_conflito_versao():
+    st.error("Esta reunião foi alterada ou cancelada por outro usuário enquanto você editava. "
+             "Os dados atuais foram carregados; revise e tente novamente.")
+
+# Função para atualizar um evento existente
+# 'versao_esperada' é a versão que o usuário abriu para edição; a gravação só
+# acontece se o documento ainda estiver nessa versão (compare-and-swap).
+# Em uma reunião recorrente, só a ocorrência é alterada: ela vira exceção da
+# regra e a versão editada é gravada como um evento simples.
+def atualizar_evento(evento_id, evento_atualizado, versao_esperada=None):
+    ocorrencia = separar_id_ocorrencia(evento_id)
+    if ocorrencia is not None:
+        regra = _regra_da_ocorrencia(ocorrencia[0], versao_esperada)
+        if regra is None or verificar_conflito(evento_atualizado, ignorar_id=evento_id):
+            return False
+        nova_regra = {**com_excecao(regra, ocorrencia[1]), 'versao': regra['versao'] + 1}
+        evento = obter_store().adicionar(evento_atualizado)
+        obter_cache_eventos().substituir_regra(regra['id'], nova_regra)
+        enviar_operacoes([(ATUALIZAR, nova_regra), (INSERIR, evento)])
+        return True
+
+    store, atual = _evento_atual(evento_id)
+    if atual is None:
+        informar_conflito_versao()
+        return False
+    if versao_esperada is None:
+        versao_esperada = atual['versao']
+    if atual['versao'] != versao_esperada:
+        informar_conflito_versao()
+        return False
+    if verificar_conflito(evento_atualizado, ignorar_id=evento_id):
+        return False
+    evento = store.atualizar(evento_id, {**evento_atualizado, 'versao': versao_esperada + 1})
+    enviar_operacoes([(ATUALIZAR, evento)])
+    return True
+
+# Função para excluir um evento
+# Em uma reunião recorrente, cancela apenas a ocorrência (exceção na regra).
+def excluir_evento(evento_id, versao_esperada=None):
+    ocorrencia = separar_id_ocorrencia(evento_id)
+    if ocorrencia is not None:
+        regra = _regra_da_ocorrencia(ocorrencia[0], versao_esperada)
+        if regra is None:
+            return False
+        nova_regra = {**com_excecao(regra, ocorrencia[1]), 'versao': regra['versao'] + 1}
+        obter_cache_eventos().substituir_regra(regra['id'], nova_regra)
+        enviar_operacoes([(ATUALIZAR, nova_regra)])
+        return True
+
+    store, atual = _evento_atual(evento_id)
+    if atual is None:
+        informar_conflito_versao()
+        return False
+    if versao_esperada is None:
+        versao_esperada = atual['versao']
+    if atual['versao'] != versao_esperada:
+        informar_conflito_versao()
+        return False
+    store.remover(evento_id)
+    enviar_operacoes([(EXCLUIR, atual)])
+    return True
@@ -0,0 +1,103 @@
+from collections import Counter
+import numpy as np
+import pandas as pd
+from esquema import converter_data
+
+# Valor usado para datas que não puderam ser lidas; nunca cai em um intervalo
+_SEM_DATA = np.iinfo(np.int64).min
+
+
+def epoch(momento):
+    """Segundos desde 1970-01-01 de uma data (datetime ou ISO), sem fuso, como na aplicação."""
+    return int(np.datetime64(converter_data(momento), 's').astype(np.int64))
+
+
+def _epochs(valores):
+    # Conversão vetorizada das datas ISO normalizadas; se alguma não estiver no
+    # formato, o pandas converte as demais e só as que falharem são lidas uma a uma
+    try:
+        return np.array(valores, dtype='datetime64[s]').astype(np.int64)
+    except (TypeError, ValueError):
+        datas = pd.to_datetime(pd.Series(valores, dtype=object), format='%Y-%m-%dT%H:%M:%S', errors='coerce')
+        epochs = datas.to_numpy(dtype='datetime64[s]').astype(np.int64)
+        for posicao in np.flatnonzero(datas.isna().to_numpy()):
+            try:
+                epochs[posicao] = epoch(valores[posicao])
+            except (AttributeError, TypeError, ValueError):
+                epochs[posicao] = _SEM_DATA
+        return epochs
+
+
+def _codigo_mes(ano, mes):
+    # Meses desde janeiro de 1970, o mesmo valor de datetime64[M]
+    return (ano - 1970) * 12 + mes - 1
+
+
+class TabelaEventos:
+    """
+    Fotografia colunar de uma lista de eventos, ordenada pelo início.
+
+    As datas são convertidas uma única vez para int64 (segundos desde 1970) e
+    os departamentos viram códigos inteiros. Filtros por mês e por intervalo e
+    a contagem de cobertura são operações sobre os arrays; os dicionários dos
+    eventos só são montados para as linhas devolvidas. As verificações de
+    conflito não passam por aqui, e sim pelo índice de intervalos do
+    EventStore. A tabela não é alterada depois de criada: o EventStore cria
+    outra quando os eventos mudam.
+    """
+
+    def __init__(self, eventos):
+        eventos = list(eventos)
+        inicio = _epochs([evento['start'] for evento in eventos])
+        fim = _epochs([evento['end'] for evento in eventos])
+        # Datas inválidas ficam no começo e não se sobrepõem a nada
+        fim[inicio == _SEM_DATA] = _SEM_DATA
+        ordem = np.argsort(inicio, kind='stable')
+        self._eventos = [eventos[linha] for linha in ordem]
+        self.inicio, self.fim = inicio[ordem], fim[ordem]
+        # Mês do início (meses desde 1970); não decresce, pois a tabela está ordenada
+        self.mes = np.where(self.inicio == _SEM_DATA, -1,
+                            self.inicio.astype('datetime64[s]').astype('datetime64[M]').astype(np.int64))
+        codigos, categorias = pd.factorize(
+            pd.Series([evento.get('departamento') or None for evento in self._eventos], dtype=object)
+        )
+        # Código do departamento de cada linha (-1 sem departamento)
+        self.departamento = codigos.astype(np.int32)
+        self.departamentos = list(categorias)
+
+    def __len__(self):
+        return len(self._eventos)
+
+    def eventos(self, linhas):
+        """Dicionários dos eventos das linhas, na ordem dada."""
+        return [self._eventos[linha] for linha in linhas]
+
+    def do_mes(self, mes, ano=None):
+        """Linhas dos eventos que começam no mês (de qualquer ano se 'ano' for None)."""
+        if ano is None:
+            return np.flatnonzero((self.mes >= 0) & (self.mes % 12 == mes - 1))
+        codigo = _codigo_mes(ano, mes)
+        return np.arange(np.searchsorted(self.mes, codigo, 'left'), np.searchsorted(self.mes, codigo, 'right'))
+
+    def no_intervalo(self, inicio, fim):
+        """Linhas dos eventos que se sobrepõem a [inicio, fim), pelo início."""
+        # Só os eventos que começam antes de 'fim' podem se sobrepor
+        limite = np.searchsorted(self.inicio, epoch(fim), 'left')
+        return np.flatnonzero(self.fim[:limite] > epoch(inicio))
+
+    def contagem_por_mes(self):
+        """Counter {(departamento, ano, mes): reuniões}, agrupando códigos com np.unique."""
+        validas = (self.departamento >= 0) & (self.mes >= 0)
+        if not validas.any():
+            return Counter()
+        meses = self.mes[validas]
+        base = int(meses.min())
+        quantidade_meses = int(meses.max()) - base + 1
+        chaves, quantidades = np.unique(self.departamento[validas].astype(np.int64) * quantidade_meses
+                                        + (meses - base), return_counts=True)
+        contagem = Counter()
+        for chave, quantidade in zip(chaves.tolist(), quantidades.tolist()):
+            codigo, mes = divmod(chave, quantidade_meses)
+            ano, mes = divmod(base + mes, 12)
+            contagem[(self.departamentos[codigo], 1970 + ano, mes + 1)] = quantidade
+        return contagem
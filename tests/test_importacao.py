@@ -0,0 +1,51 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from importacao import ler_ics, linhas_ics
+
+
+def _ics(*propriedades):
+    return ['BEGIN:VCALENDAR', 'BEGIN:VEVENT', 'SUMMARY:Reunião', *propriedades, 'END:VEVENT', 'END:VCALENDAR']
+
+
+def test_data_em_utc_e_convertida_para_o_horario_local():
+    evento, = ler_ics(_ics('DTSTART:20250512T140000Z', 'DTEND:20250512T150000Z'))
+    assert evento['start'] == '2025-05-12T11:00:00'
+    assert evento['end'] == '2025-05-12T12:00:00'
+
+
+def test_data_com_tzid_e_convertida_para_o_horario_local():
+    evento, = ler_ics(_ics('DTSTART;TZID=America/New_York:20250512T100000',
+                           'DTEND;TZID="America/New_York":20250512T110000'))
+    assert evento['start'] == '2025-05-12T11:00:00'
+    assert evento['end'] == '2025-05-12T12:00:00'
+
+
+def test_data_sem_fuso_ou_com_tzid_desconhecido_mantem_o_horario():
+    evento, = ler_ics(_ics('DTSTART:20250512T140000',
+                           'DTEND;TZID=E. South America Standard Time:20250512T150000'))
+    assert evento['start'] == '2025-05-12T14:00:00'
+    assert evento['end'] == '2025-05-12T15:00:00'
+
+
+def test_exportacao_e_importacao_preservam_o_horario():
+    exportado = {'id': '1', 'title': 'Reunião', 'start': '2025-05-12T14:00:00', 'end': '2025-05-12T15:00:00',
+                 'departamento': 'CSA Lago Sul', 'participantes': ['Ana'], 'description': ''}
+    evento, = ler_ics(''.join(linhas_ics([exportado])).splitlines())
+    assert (evento['start'], evento['end']) == (exportado['start'], exportado['end'])
+
+
+def test_barra_escapada_seguida_de_n_nao_vira_quebra_de_linha():
+    evento, = ler_ics(['BEGIN:VCALENDAR', 'BEGIN:VEVENT', 'SUMMARY:C:\\\\novo\\, pasta\\nfim',
+                       'DTSTART:20250512T140000', 'DTEND:20250512T150000', 'END:VEVENT', 'END:VCALENDAR'])
+    assert evento['title'] == 'C:\\novo, pasta\nfim'
+
+
+def test_linhas_longas_sao_dobradas_em_75_octetos():
+    exportado = {'id': '1', 'title': 'Reunião de coordenação ' * 10, 'start': '2025-05-12T14:00:00',
+                 'end': '2025-05-12T15:00:00', 'departamento': None, 'participantes': [], 'description': ''}
+    linhas = ''.join(linhas_ics([exportado])).split('\r\n')
+    assert max(len(linha.encode('utf-8')) for linha in linhas) <= 75
+    evento, = ler_ics(linhas)
+    assert evento['title'] == exportado['title']
@@ -0,0 +1,56 @@
+import os
+import sys
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from persistencia import INSERIR, ATUALIZAR, EXCLUIR, aplicar_operacoes, aplicar_com_resultados
+
+mongomock = pytest.importorskip('mongomock')
+
+
+def _evento(evento_id, versao, start='2025-05-05T10:00:00'):
+    return {'id': evento_id, 'title': evento_id, 'start': start, 'end': '2025-05-05T11:00:00',
+            'departamento': 'A', 'participantes': [], 'versao': versao}
+
+
+@pytest.fixture
+def colecao(monkeypatch):
+    # O pymongo 4.9+ passa 'sort' às operações do bulk_write, que o mongomock não aceita
+    construtor = mongomock.collection.BulkOperationBuilder
+    for nome in ('add_replace', 'add_update'):
+        original = getattr(construtor, nome)
+        monkeypatch.setattr(construtor, nome,
+                            lambda self, *args, _original=original, sort=None, **kwargs: _original(self, *args, **kwargs))
+    colecao = mongomock.MongoClient().db.eventos
+    aplicar_operacoes(colecao, [(INSERIR, _evento('a' * 24, 1)), (INSERIR, _evento('b' * 24, 1))])
+    return colecao
+
+
+def test_lote_com_atualizacoes_seguidas_so_acusa_a_operacao_desatualizada(colecao):
+    operacoes = [
+        (ATUALIZAR, _evento('a' * 24, 5)),   # base 4: desatualizada
+        (ATUALIZAR, _evento('b' * 24, 2)),
+        (ATUALIZAR, _evento('b' * 24, 3)),
+    ]
+    assert aplicar_com_resultados(colecao, operacoes) == [False, True, True]
+    assert colecao.find_one({'_id': mongomock.ObjectId('b' * 24)})['versao'] == 3
+
+
+def test_atualizar_e_excluir_o_mesmo_evento_no_lote_nao_gera_conflito(colecao):
+    operacoes = [
+        (ATUALIZAR, _evento('a' * 24, 2)),
+        (EXCLUIR, _evento('a' * 24, 2)),
+    ]
+    assert aplicar_operacoes(colecao, operacoes) == []
+    assert colecao.find_one({'_id': mongomock.ObjectId('a' * 24)}) is None
+
+
+def test_cadeia_interrompida_acusa_o_id_uma_vez(colecao):
+    operacoes = [
+        (ATUALIZAR, _evento('a' * 24, 3)),   # base 2: desatualizada
+        (ATUALIZAR, _evento('a' * 24, 4)),
+        (ATUALIZAR, _evento('b' * 24, 2)),
+    ]
+    assert aplicar_com_resultados(colecao, operacoes) == [False, False, True]
+    assert aplicar_operacoes(colecao, [(EXCLUIR, _evento('a' * 24, 9)), (EXCLUIR, _evento('b' * 24, 2))]) \
+        == ['a' * 24]